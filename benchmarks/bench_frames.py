@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Frame times of a 60 FPS render loop while Auto-Solve runs.
+
+Draws a board-sized frame (64 rounded tiles and their labels) with
+pygame's dummy video driver, paced by Clock.tick(60), in three cases:
+no search, the search in a thread of the same process (how Auto-Solve
+used to run), and the search in a worker process polled once per frame
+(puzzle_core.solve_worker). The search enumerates every solution of a
+slow date with the atlas and cache bypassed, so it runs for the whole
+measurement.
+
+This is a stand-in for the game's main() loop, not that loop itself: it
+isolates what the search costs the renderer, not the game's frame time.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pygame  # noqa: E402
+
+import puzzle_core as core  # noqa: E402
+from bench_solver import forbidden_for  # noqa: E402
+
+FPS = 60
+CELL = 64
+# NOV 7 SAT took longest to enumerate (see bench_solver.BENCH_DATES).
+BENCH_DATE = ("NOV", 7, "SAT")
+
+
+def draw_frame(surface, font):
+    surface.fill((46, 52, 64))
+    for (x, y), info in core.cell_label.items():
+        rect = pygame.Rect(x * CELL + 2, y * CELL + 2, CELL - 4, CELL - 4)
+        pygame.draw.rect(surface, (67, 76, 94), rect, border_radius=8)
+        text = font.render(info["text"], True, (236, 239, 244))
+        surface.blit(text, text.get_rect(center=rect.center))
+
+
+def thread_search(forbidden, seconds, cancel):
+    solver, row_map = core.build_exact_cover(forbidden)
+    for rows in solver.iter_solutions(time_limit=seconds, cancel=cancel):
+        core.solutions_from_rows(row_map, [rows])
+
+
+def frame_stats(frame_ms):
+    ordered = sorted(frame_ms)
+    budget = 1000 / FPS
+    return {
+        "frames": len(ordered),
+        "fps": round(1000 * len(ordered) / sum(ordered), 1),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)], 2),
+        "max_ms": round(ordered[-1], 2),
+        "late_frames": sum(ms > budget * 1.5 for ms in ordered),
+    }
+
+
+def measure(mode, seconds):
+    """Frame times in ms over `seconds` with the search run as `mode`."""
+    surface = pygame.Surface((core.GRID_W * CELL, core.GRID_H * CELL))
+    font = pygame.font.Font(None, CELL // 3)
+    clock = pygame.time.Clock()
+    forbidden = forbidden_for(BENCH_DATE)
+    out = cancel = process = None
+    if mode == "thread":
+        cancel = core.CancelToken()
+        threading.Thread(target=thread_search, args=(forbidden, seconds + 1, cancel), daemon=True).start()  # noqa: E501
+    elif mode == "process":
+        ctx = multiprocessing.get_context()
+        out = ctx.Queue()
+        cancel = core.ProcessCancelToken(ctx)
+        process = ctx.Process(target=core.solve_worker, args=(forbidden, out, cancel),
+                              kwargs={"time_limit": seconds + 1, "max_solutions": None, "use_cache": False},  # noqa: E501
+                              daemon=True)
+        process.start()
+    solutions = 0
+    frame_ms = []
+    clock.tick(FPS)
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        draw_frame(surface, font)
+        while out is not None:
+            try:
+                msg = out.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == core.SOLUTIONS:
+                solutions += len(core.decode_solutions(msg[1]))
+        frame_ms.append(clock.tick(FPS))
+    if cancel is not None:
+        cancel.cancel()
+    if process is not None:
+        process.join()
+    result = frame_stats(frame_ms[1:])
+    if mode == "process":
+        result["solutions_received"] = solutions
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure render-loop frame times during Auto-Solve.")  # noqa: E501
+    parser.add_argument("--seconds", type=float, default=3.0, help="measurement time per case")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    core.all_placements()  # warm the placement table so no case pays for it
+    results = {}
+    for mode in ("idle", "thread", "process"):
+        r = results[mode] = measure(mode, args.seconds)
+        print(f"{mode:>8}: {r['fps']:5.1f} fps, p50 {r['p50_ms']:.1f}ms, p95 {r['p95_ms']:.1f}ms, "
+              f"max {r['max_ms']:.1f}ms, {r['late_frames']} of {r['frames']} frames late", flush=True)  # noqa: E501
+    pygame.quit()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Solver benchmarks: placement generation, matrix build, time to the first
+solution and full enumeration for a fixed set of dates.
+
+Results are written as JSON and compared against a committed baseline;
+the run fails if any metric regresses by more than the threshold.
+Timings are machine-dependent, so refresh the baseline (--update-baseline)
+when benchmarking on different hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import puzzle_core as core  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (month, day, weekday). Of all 2026 dates, APR 6 has the fewest solutions
+# (97) and NOV 7 took longest to count; JAN 1 and OCT 16 are typical.
+BENCH_DATES = [
+    ("JAN", 1, "THU"),
+    ("OCT", 16, "FRI"),
+    ("APR", 6, "MON"),
+    ("NOV", 7, "SAT"),
+]
+
+# metric -> (lower is better, smallest change worth reporting)
+METRICS = {
+    "generate_placements_ms": (True, 1.0),
+    "build_ms": (True, 1.0),
+    "first_solution_ms": (True, 2.0),
+    "enumerate_s": (True, 0.1),
+    "nodes_per_sec": (False, 500),
+    "peak_kb": (True, 64),
+}
+
+
+def date_name(labels):
+    month, day, weekday = labels
+    return f"{month}-{day}-{weekday}"
+
+
+def forbidden_for(labels):
+    """Return the three uncovered cells for (month, day, weekday)."""
+    month, day, weekday = labels
+    wanted = {("month", month), ("date", str(day)), ("weekday", weekday)}
+    return {pos for pos, info in core.cell_label.items() if (info["type"], info["text"]) in wanted}
+
+
+def best_of(repeat, func):
+    """Fastest of `repeat` calls to func(), in seconds, after one warm-up call."""
+    func()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def bench_date(labels, engine="bitboard", repeat=20):
+    forbidden = forbidden_for(labels)
+    result = {
+        "generate_placements_ms": best_of(repeat, lambda: core.generate_placements(forbidden)) * 1000,  # noqa: E501
+        "build_ms": best_of(repeat, lambda: core.build_exact_cover(forbidden, engine)) * 1000,
+        "first_solution_ms": best_of(
+            repeat, lambda: core.dlx_build_and_solve_all(forbidden, None, 1, engine)
+        ) * 1000,
+    }
+
+    solver, _ = core.build_exact_cover(forbidden, engine)
+    start = time.perf_counter()
+    sols = solver.solve_all()
+    elapsed = time.perf_counter() - start
+    result["enumerate_s"] = elapsed
+    result["solutions"] = len(sols)
+    result["nodes"] = solver.nodes
+    result["nodes_per_sec"] = solver.nodes / elapsed if elapsed else 0.0
+
+    # Separate pass: tracemalloc slows the search down a lot.
+    del sols, solver
+    tracemalloc.start()
+    solver, _ = core.build_exact_cover(forbidden, engine)
+    solver.solve_all()
+    result["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(dates=BENCH_DATES, engine="bitboard", repeat=20, progress=None):
+    core.compiled_placements()  # one-time setup, not part of any per-date metric
+    results = {
+        "engine": engine,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "dates": {},
+    }
+    for labels in dates:
+        results["dates"][date_name(labels)] = bench_date(labels, engine, repeat)
+        if progress is not None:
+            progress(date_name(labels), results["dates"][date_name(labels)])
+    return results
+
+
+def compare(results, baseline, threshold=0.25):
+    """Describe every metric that is more than `threshold` worse than baseline."""
+    problems = []
+    if baseline.get("engine") != results.get("engine"):
+        return [f"baseline is for engine {baseline.get('engine')!r}, not {results.get('engine')!r}"]  # noqa: E501
+    for name, old in baseline.get("dates", {}).items():
+        new = results["dates"].get(name)
+        if new is None:
+            continue
+        if new["solutions"] != old["solutions"]:
+            problems.append(f"{name}: {new['solutions']} solutions, baseline has {old['solutions']}")  # noqa: E501
+        for metric, (lower_is_better, min_delta) in METRICS.items():
+            if metric not in old or metric not in new:
+                continue
+            before, after = old[metric], new[metric]
+            worse = after - before if lower_is_better else before - after
+            if worse > min_delta and worse > threshold * before:
+                problems.append(f"{name}: {metric} {before:.2f} -> {after:.2f} ({worse / before:+.0%})")  # noqa: E501
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the auto-solver.")
+    parser.add_argument("--engine", choices=["bitboard", "dlx", "dlx-array"], default="bitboard")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per timing (best is kept)")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")  # noqa: E501
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    def progress(name, r):
+        print(f"{name}: placements {r['generate_placements_ms']:.2f}ms, build {r['build_ms']:.2f}ms, "  # noqa: E501
+              f"first {r['first_solution_ms']:.2f}ms, all {r['solutions']} in {r['enumerate_s']:.2f}s "  # noqa: E501
+              f"({r['nodes_per_sec']:.0f} nodes/s), peak {r['peak_kb']:.0f}KB", flush=True)
+
+    results = run_benchmarks(engine=args.engine, repeat=args.repeat, progress=progress)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problems = compare(results, baseline, args.threshold)
+    if problems:
+        print("Regressions against the baseline:")
+        for problem in problems:
+            print("  " + problem)
+        return 1
+    print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+# Batch Auto-Solve across many dates, fanned out over worker processes.
+# Each worker runs the same generate_placements()/solver code as the game.
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, TimeoutError, as_completed, wait  # noqa: E501
+
+import puzzle_core as core
+
+
+def solve_date(day, time_limit=None, max_solutions=None, engine="bitboard",
+               prune_regions=core.PRUNE_DEAD_REGIONS):
+    """Solve a single date in this process; returns (date, solutions, seconds)."""
+    start = time.time()
+    forbidden = set(core.get_date_labels(day))
+    if None in forbidden:
+        return day, [], time.time() - start
+    sols = core.dlx_build_and_solve_all(
+        forbidden, time_limit=time_limit, max_solutions=max_solutions, engine=engine,
+        prune_regions=prune_regions,
+    )
+    return day, sols, time.time() - start
+
+
+def count_date(day, time_limit=None):
+    """Count a date's solutions in this process; returns (date, count, seconds)."""
+    start = time.time()
+    forbidden = set(core.get_date_labels(day))
+    if None in forbidden:
+        return day, 0, time.time() - start
+    return day, core.count_solutions(forbidden, time_limit=time_limit), time.time() - start
+
+
+def _map_dates(func, dates, max_workers, *args):
+    # Only a couple of dates per worker are in flight at once, so memory
+    # stays flat however long the range is.
+    if max_workers == 1:
+        for day in dates:
+            yield func(day, *args)
+        return
+    dates = iter(dates)
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        for day in dates:
+            pending.add(pool.submit(func, day, *args))
+            if len(pending) >= window:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+                day = next(dates, None)
+                if day is not None:
+                    pending.add(pool.submit(func, day, *args))
+
+
+def solve_dates(dates, max_workers=None, time_limit=None, max_solutions=None, engine="bitboard",
+                prune_regions=core.PRUNE_DEAD_REGIONS):
+    """Solve `dates` in parallel, yielding (date, solutions, seconds) as each finishes.
+
+    Results arrive in completion order, not input order.
+    """
+    return _map_dates(solve_date, dates, max_workers, time_limit, max_solutions, engine,
+                      prune_regions)
+
+
+def count_dates(dates, max_workers=None, time_limit=None):
+    """Like solve_dates(), but yields (date, solution count, seconds)."""
+    return _map_dates(count_date, dates, max_workers, time_limit)
+
+
+# Last matrix built in this worker; subtrees of one date all reuse it.
+_worker_matrix = {}
+# Set by solve_parallel() once it has enough, so running subtrees stop too.
+_worker_cancel = None
+
+
+def _init_subtree_worker(cancel):
+    global _worker_cancel
+    _worker_cancel = cancel
+
+
+def _solve_subtree(forbidden, prefix, deadline, max_solutions, engine, prune_regions):
+    key = (frozenset(forbidden), engine, prune_regions)
+    solver = _worker_matrix.get(key)
+    if solver is None:
+        _worker_matrix.clear()
+        solver, _ = core.build_exact_cover(forbidden, engine, prune_regions)
+        _worker_matrix[key] = solver
+    time_limit = None if deadline is None else max(0.0, deadline - time.time())
+    sols = solver.solve_subtree(prefix, time_limit, max_solutions, cancel=_worker_cancel)
+    return [core.solution_row_ids(sol) for sol in sols]
+
+
+def solve_parallel(forbidden, time_limit=None, max_solutions=None, max_workers=None,
+                   split_depth=2, engine="bitboard", prune_regions=core.PRUNE_DEAD_REGIONS):
+    """Solve one date by farming the top of its search tree out to worker processes.
+
+    The first `split_depth` branching levels are expanded here, and every
+    subtree (a list of chosen row ids) is searched in a worker. `time_limit`
+    and `max_solutions` apply to the whole search, not to each subtree:
+    once either is reached, subtrees still running are cancelled and the
+    pool is shut down before returning.
+    A full enumeration returns solutions in the same order as a serial search.
+    """
+    start = time.time()
+    deadline = None if time_limit is None else start + time_limit
+    solver, row_map = core.build_exact_cover(forbidden, engine, prune_regions)
+    prefixes = solver.branch_prefixes(split_depth)
+
+    by_prefix = [None] * len(prefixes)
+    found = 0
+    ctx = multiprocessing.get_context()
+    cancel = core.ProcessCancelToken(ctx)
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                               initializer=_init_subtree_worker, initargs=(cancel,))
+    futures = {}
+    try:
+        futures = {
+            pool.submit(_solve_subtree, forbidden, prefix, deadline, max_solutions, engine,
+                        prune_regions): i
+            for i, prefix in enumerate(prefixes)
+        }
+        remaining = None if deadline is None else max(0.0, deadline - time.time())
+        try:
+            for fut in as_completed(futures, timeout=remaining):
+                sols = fut.result()
+                by_prefix[futures[fut]] = sols
+                found += len(sols)
+                if max_solutions is not None and found >= max_solutions:
+                    break
+        except TimeoutError:
+            pass
+    finally:
+        # Queued subtrees are dropped by hand rather than with
+        # shutdown(cancel_futures=True), which needs 3.9; running ones see
+        # the token at their next budget check and return early.
+        cancel.cancel()
+        for fut in futures:
+            fut.cancel()
+        pool.shutdown()
+
+    sols_rows = [sol for sols in by_prefix if sols for sol in sols]
+    if max_solutions is not None:
+        sols_rows = sols_rows[:max_solutions]
+    return core.solutions_from_rows(row_map, sols_rows)
+
+
+def solution_json(sol):
+    """A solution as JSON-ready dicts, one per piece in piece order."""
+    return [
+        {"piece": pid, "x": x0, "y": y0, "rot": rot, "flip": flip, "cells": [list(c) for c in cells]}  # noqa: E501
+        for pid, (x0, y0, rot, flip, cells) in enumerate(sol)
+    ]
+
+
+def jsonl_lines(day, result, elapsed, per_solution=False):
+    """JSON lines for one date: a summary line, or one line per solution.
+
+    `result` is the date's solution list, or just a count (--count).
+    """
+    record = {"date": day.isoformat(), "weekday": day.strftime("%a").upper()}
+    if isinstance(result, int):
+        yield json.dumps(dict(record, count=result, seconds=round(elapsed, 4)), separators=(",", ":"))  # noqa: E501
+    elif per_solution:
+        for i, sol in enumerate(result):
+            yield json.dumps(dict(record, index=i, solution=solution_json(sol)), separators=(",", ":"))  # noqa: E501
+    else:
+        yield json.dumps(
+            dict(record, count=len(result), seconds=round(elapsed, 4),
+                 solutions=[solution_json(sol) for sol in result]),
+            separators=(",", ":"),
+        )
+
+
+def date_range(first, last):
+    day = first
+    while day <= last:
+        yield day
+        day += datetime.timedelta(days=1)
+
+
+def main(argv=None):
+    this_year = datetime.date.today().year
+    parser = argparse.ArgumentParser(description="Auto-Solve a range of dates in parallel.")
+    parser.add_argument("--from", dest="first", type=datetime.date.fromisoformat,
+                        default=datetime.date(this_year, 1, 1), help="first date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="last", type=datetime.date.fromisoformat,
+                        default=datetime.date(this_year, 12, 31), help="last date (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")  # noqa: E501
+    parser.add_argument("--max-solutions", type=int, default=0, help="solutions per date (0 = all)")  # noqa: E501
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per date")
+    parser.add_argument("--engine", choices=["bitboard", "dlx", "dlx-array"], default="bitboard")
+    parser.add_argument("--prune-regions", action="store_true",
+                        help="drop branches that leave an unfillable region")
+    parser.add_argument("--count", action="store_true",
+                        help="only count solutions (ignores --max-solutions and --engine)")
+    parser.add_argument("--split-depth", type=int, default=0,
+                        help="solve dates one by one, splitting each search tree this many levels deep")  # noqa: E501
+    parser.add_argument("--jsonl", action="store_true",
+                        help="write one JSON line per date to stdout (progress goes to stderr)")
+    parser.add_argument("--per-solution", action="store_true",
+                        help="with --jsonl, write one line per solution instead")
+    args = parser.parse_args(argv)
+
+    if args.count:
+        def results():
+            return count_dates(
+                date_range(args.first, args.last),
+                max_workers=args.workers,
+                time_limit=args.time_limit,
+            )
+    elif args.split_depth:
+        def results():
+            for day in date_range(args.first, args.last):
+                t0 = time.time()
+                sols = solve_parallel(
+                    set(core.get_date_labels(day)),
+                    time_limit=args.time_limit,
+                    max_solutions=args.max_solutions or None,
+                    max_workers=args.workers,
+                    split_depth=args.split_depth,
+                    engine=args.engine,
+                    prune_regions=args.prune_regions,
+                )
+                yield day, sols, time.time() - t0
+    else:
+        def results():
+            return solve_dates(
+                date_range(args.first, args.last),
+                max_workers=args.workers,
+                time_limit=args.time_limit,
+                max_solutions=args.max_solutions or None,
+                engine=args.engine,
+                prune_regions=args.prune_regions,
+            )
+
+    log = sys.stderr if args.jsonl else sys.stdout
+    start = time.time()
+    solved = 0
+    unsolved = []
+    for day, result, elapsed in results():
+        count = result if isinstance(result, int) else len(result)
+        if args.jsonl:
+            for line in jsonl_lines(day, result, elapsed, args.per_solution):
+                sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+        else:
+            print(f"{day.isoformat()} {day.strftime('%a').upper()}: {count} solutions in {elapsed:.2f}s", flush=True)  # noqa: E501
+        if count:
+            solved += 1
+        else:
+            unsolved.append(day)
+
+    print(f"Solved {solved} dates in {time.time() - start:.1f}s", file=log)
+    if unsolved:
+        print("No solution found for: " + ", ".join(d.isoformat() for d in sorted(unsolved)), file=log)  # noqa: E501
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,33 @@
 # Caesar's Calendar Puzzle with DLX Auto-Solver (cleaned + no board outline shadow)
 # For detailed documentation of helper functions, see docs/HELPER_FUNCTIONS.md
+# Board layout, pieces and the solver live in puzzle_core.py; this is the pygame front-end.
 import datetime
+import multiprocessing
 import os
-import random
+import queue
 import sys
-import threading
 import time
+from collections import OrderedDict
 
+import numpy as np
 import pygame
 
-pygame.init()
-
-# ------------------ BOARD SIZE ------------------
-GRID_W = 8
-GRID_H = 8
+from puzzle_core import (
+    GRID_H,
+    GRID_W,
+    PIECES_BASE,
+    PROGRESS,
+    SOLUTIONS,
+    ProcessCancelToken,
+    board_mask,
+    cell_label,
+    decode_solutions,
+    get_date_labels,
+    oriented_cells,
+    pieces,
+    solve_worker,
+    void_cells,
+)
 
 # ------------------ THEMES ------------------
 THEMES = [
@@ -103,20 +117,6 @@ THEMES = [
     },
 ]
 
-# ------------------ PIECES ------------------
-PIECES_BASE = [
-    [(0, 0), (0, 1), (0, 2), (0, 3), (1, 3)],  # 1 Tall L
-    [(0, 0), (0, 1), (0, 2), (1, 2)],  # 2 Short L
-    [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1)],  # 3 U-shape
-    [(0, 0), (1, 0), (1, 1), (2, 1), (3, 1)],  # 4 long Z
-    [(0, 0), (1, 0), (1, 1), (2, 1)],  # 5 short Z
-    [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2)],  # 6 T
-    [(0, 0), (0, 1), (0, 2), (0, 3)],  # 7 line
-    [(0, 0), (1, 0), (0, 1), (1, 1), (2, 1)],  # 8 2x2+tab
-    [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0)],  # 9 Г
-    [(0, 0), (1, 0), (1, 1), (1, 2), (2, 2)],  # 10 custom S-like
-]
-
 # ------------------ WINDOW & LAYOUT HELPERS ------------------
 def get_piece_dimensions(piece_collection=None):
     """Calculate max width and height across all pieces."""
@@ -163,96 +163,10 @@ def compute_initial_cell(win_w: int, win_h: int) -> int:
 
 
 win_w, win_h = 1000, 600
-screen = pygame.display.set_mode((win_w, win_h), pygame.RESIZABLE)
-pygame.display.set_caption("Caesar's Calendar Puzzle")
-clock = pygame.time.Clock()
-
-# ------------------ BOARD LAYOUT ------------------
-MONTHS = [
-    "JAN",
-    "FEB",
-    "MAR",
-    "APR",
-    "MAY",
-    "JUN",
-    "JUL",
-    "AUG",
-    "SEP",
-    "OCT",
-    "NOV",
-    "DEC",
-]
-WEEKROW1 = ["SUN", "MON", "TUE", "WED"]
-WEEKROW2 = ["THU", "FRI", "SAT"]
-
-board_mask = set()
-void_cells = set()
-cell_label = {}
-
-
-def build_layout() -> None:
-    board_mask.clear()
-    void_cells.clear()
-    cell_label.clear()
-    mi = 0
-    for ry in range(2):
-        for cx in range(1, 7):
-            pos = (cx, ry)
-            board_mask.add(pos)
-            cell_label[pos] = {"type": "month", "text": MONTHS[mi]}
-            mi += 1
-    void_cells.update({(7, 0), (7, 1)})
-
-    dx0, dy0 = 1, 2
-    day = 1
-    for ry in range(5):
-        for cx in range(7):
-            x, y = dx0 + cx, dy0 + ry
-            if day <= 31:
-                board_mask.add((x, y))
-                cell_label[(x, y)] = {"type": "date", "text": str(day)}
-                day += 1
-            else:
-                void_cells.add((x, y))
-
-    for i, wd in enumerate(WEEKROW1):
-        x, y = 4 + i, 6
-        board_mask.add((x, y))
-        cell_label[(x, y)] = {"type": "weekday", "text": wd}
-
-    for i, wd in enumerate(WEEKROW2):
-        x, y = 5 + i, 7
-        board_mask.add((x, y))
-        cell_label[(x, y)] = {"type": "weekday", "text": wd}
-
-    void_cells.update({(1, 7), (2, 7), (3, 7), (4, 7)})
-
-
-build_layout()
-
-# ------------------ PIECE ORIENTATION UTILS ------------------
-def rotate_shape(s):
-    return [(-y, x) for (x, y) in s]
-
-
-def flip_shape(s):
-    return [(-x, y) for (x, y) in s]
-
-
-def normalize(s):
-    minx = min(x for x, _ in s)
-    miny = min(y for _, y in s)
-    return [(x - minx, y - miny) for (x, y) in s]
-
-
-def oriented_cells(base_cells, rot, flip):
-    s = list(base_cells)
-    if flip:
-        s = flip_shape(s)
-    for _ in range(rot % 4):
-        s = rotate_shape(s)
-    return normalize(s)
-
+# Created by init_window(); importing this module opens no window, so a
+# spawned solver process only pays for the definitions.
+screen = None
+clock = None
 
 # ------------------ FONT SCALE CONSTANTS ------------------
 FONT_SCALE_CONTROLS = 0.28
@@ -282,16 +196,76 @@ def get_font_path(font_name):
     return None
 
 
-def choose_font(sz, bold=False):
+class LRUCache:
+    """Dict of at most `max_entries` items; the least recently used goes first."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, make):
+        """The value for `key`, calling make() to create it on a miss."""
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+        self.misses += 1
+        value = self.entries[key] = make()
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+
+# Fonts by (size, bold), and rendered text by (text, font key, color). A
+# window has about a dozen font sizes; the text cache holds every label
+# and HUD line, and the running timer just cycles through its oldest slots.
+font_cache = LRUCache(32)
+text_cache = LRUCache(256)
+
+
+def load_font(sz, bold=False):
     try:
         return pygame.font.SysFont("Consolas", sz, bold=bold)
     except Exception:
         return pygame.font.SysFont("Courier New", sz, bold=bold)
 
 
+def choose_font(sz, bold=False):
+    """Font of size `sz`, loaded once and then served from font_cache."""
+    return font_cache.get((sz, bold), lambda: load_font(sz, bold))
+
+
+def scaled_font_key(scale_factor, bold=False):
+    return (max(12, int(CELL * scale_factor)), bold)
+
+
 def create_scaled_font(scale_factor, bold=False):
     """Create a font scaled by CELL size with the given scale factor."""
-    return choose_font(max(12, int(CELL * scale_factor)), bold=bold)
+    return choose_font(*scaled_font_key(scale_factor, bold))
+
+
+def render_text(text, scale_factor, color, bold=False):
+    """Anti-aliased text in a CELL-scaled font, rendered once and then served from text_cache.
+
+    The surface is shared between callers: blit it, never draw on it.
+    """
+    key = scaled_font_key(scale_factor, bold)
+    return text_cache.get((text, key, color), lambda: choose_font(*key).render(text, True, color))
 
 
 PIECE_COLORS = THEMES[0]["PIECE_COLORS"]
@@ -315,16 +289,6 @@ def apply_theme():
     AUTOSOLVE_TEXT = t.get("AUTOSOLVE_TEXT", (255, 255, 255))
 
 
-pieces = [
-    {
-        "name": f"P{i + 1}",
-        "cells": normalize(base),
-        "color": PIECE_COLORS[i % len(PIECE_COLORS)],
-    }
-    for i, base in enumerate(PIECES_BASE)
-]
-
-
 def update_piece_colors():
     for i, p in enumerate(pieces):
         p["color"] = PIECE_COLORS[i % len(PIECE_COLORS)]
@@ -427,15 +391,21 @@ def update_placed_cells():
         pl["cells"] = [(pl["pos"][0] + x, pl["pos"][1] + y) for (x, y) in oc]
 
 
-recompute_palette_layout()
+def init_window():
+    """Start pygame, open the window and lay out the board and palette for it."""
+    global screen, clock
+    pygame.init()
+    screen = pygame.display.set_mode((win_w, win_h), pygame.RESIZABLE)
+    pygame.display.set_caption("Caesar's Calendar Puzzle")
+    clock = pygame.time.Clock()
+    recompute_palette_layout()
 
 # ------------------ DRAW HELPERS ------------------
 def draw_button(surface, rect, text, bg_color, border_color, text_color, font_scale=FONT_SCALE_BUTTON):
     """Draw a button with text centered."""
     pygame.draw.rect(surface, bg_color, rect, border_radius=10)
     pygame.draw.rect(surface, border_color, rect, 2, border_radius=10)
-    btn_font = create_scaled_font(font_scale, bold=True)
-    btn_text = btn_font.render(text, True, text_color)
+    btn_text = render_text(text, font_scale, text_color, bold=True)
     btn_text_rect = btn_text.get_rect(center=rect.center)
     surface.blit(btn_text, btn_text_rect)
 
@@ -472,72 +442,104 @@ def draw_board(surface, y_offset=0):
                 pygame.draw.rect(surface, VOID_TILE, rect, border_radius=8)
                 pygame.draw.rect(surface, CELL_BORDER, rect, 2, border_radius=8)
 
-    month_font = create_scaled_font(FONT_SCALE_MONTH)
-    date_font = create_scaled_font(FONT_SCALE_DATE)
-    weekday_font = create_scaled_font(FONT_SCALE_WEEKDAY)
     for (x, y), info in cell_label.items():
         sx, sy = x * CELL, y_offset + y * CELL
         t = info["text"]
         if info["type"] == "month":
-            surf = month_font.render(t, True, TEXT_COL)
+            surf = render_text(t, FONT_SCALE_MONTH, TEXT_COL)
         elif info["type"] == "weekday":
-            surf = weekday_font.render(t, True, TEXT_COL)
+            surf = render_text(t, FONT_SCALE_WEEKDAY, TEXT_COL)
         else:
-            surf = date_font.render(t, True, TEXT_COL)
+            surf = render_text(t, FONT_SCALE_DATE, TEXT_COL)
         surface.blit(surf, surf.get_rect(center=(sx + CELL / 2, sy + CELL / 2)))
 
 
+board_layer = None
+board_layer_key = None
+
+
+def get_board_layer():
+    """The board as one surface, drawn by draw_board() once per (theme_idx, CELL).
+
+    Only a theme switch or a resize that changes CELL rebuilds it; every
+    other frame just blits it.
+    """
+    global board_layer, board_layer_key
+    key = (theme_idx, CELL)
+    if key != board_layer_key:
+        layer = pygame.Surface((GRID_W * CELL, GRID_H * CELL), pygame.SRCALPHA)
+        draw_board(layer, y_offset=0)
+        board_layer = layer.convert_alpha()
+        board_layer_key = key
+    return board_layer
+
+
+def bake_piece_tile(theme, col):
+    """One piece cell in `theme`'s look: shadow, fill, grain, outline, highlight.
+
+    Drawn on a CELL x CELL surface to be blitted at the cell's top-left
+    corner; every theme's shadow stays inside that square.
+    """
+    tile = pygame.Surface((CELL, CELL), pygame.SRCALPHA)
+    r = pygame.Rect(4, 4, CELL - 8, CELL - 8)
+    if theme == "Nord":
+        pygame.draw.rect(tile, (0, 0, 0, 120), r.move(2, 2), border_radius=2)
+        pygame.draw.rect(tile, col, r, border_radius=2)
+        pygame.draw.rect(tile, (0, 0, 0), r, 3, border_radius=2)
+        inner = r.inflate(-CELL // 6, -CELL // 6)
+        pygame.draw.rect(tile, (255, 255, 255), inner, 1, border_radius=2)
+    elif theme == "Wood":
+        # Shadow
+        pygame.draw.rect(tile, (80, 60, 30, 100), r.move(2, 4), border_radius=10)
+        # Main fill
+        pygame.draw.rect(tile, col, r, border_radius=10)
+        # Wood grain texturing: draw a few random arcs/lines
+        grain_col = tuple(min(255, int(c * 1.15)) for c in col)
+        for offset in range(4, CELL-12, 7):
+            pygame.draw.arc(tile, grain_col, r.move(0, offset//2), 0.2, 2.7, 1)
+        for offset in range(8, CELL-12, 11):
+            pygame.draw.line(tile, grain_col, (r.left+4, r.top+offset), (r.right-4, r.top+offset), 1)  # noqa: E501
+        # Strong black outline
+        pygame.draw.rect(tile, (0, 0, 0), r, 4, border_radius=10)
+        # Highlight
+        highlight = pygame.Surface((CELL - 8, CELL - 8), pygame.SRCALPHA)
+        pygame.draw.rect(
+            highlight,
+            (255, 255, 220, 80),
+            (0, 0, CELL - 8, CELL // 3),
+            border_radius=10,
+        )
+        tile.blit(highlight, r.topleft)
+    elif theme == "Solarized":
+        pygame.draw.rect(tile, (0, 43, 54, 120), r.move(1, 3), border_radius=6)
+        pygame.draw.rect(tile, col, r, border_radius=6)
+        pygame.draw.rect(tile, (253, 246, 227), r, 3, border_radius=6)
+    return tile.convert_alpha()
+
+
+piece_tiles = {}
+piece_tiles_key = None
+
+
+def get_piece_tiles():
+    """Piece color -> baked tile for the current theme, rebuilt per (theme_idx, CELL)."""
+    global piece_tiles, piece_tiles_key
+    key = (theme_idx, CELL)
+    if key != piece_tiles_key:
+        theme = get_theme()["name"]
+        piece_tiles = {col: bake_piece_tile(theme, col) for col in PIECE_COLORS}
+        piece_tiles_key = key
+    return piece_tiles
+
+
 def draw_pieces(surface, highlight_idx=None):
-    theme = get_theme()["name"]
+    tiles = get_piece_tiles()
     for i, pl in enumerate(placed):
         col = pieces[pl["pid"]]["color"]
-        for cell in pl["cells"]:
-            sx, sy = cell_to_screen(*cell)
-            r = pygame.Rect(sx + 4, sy + 4, CELL - 8, CELL - 8)
-            if theme == "Nord":
-                shadow = pygame.Surface((CELL - 8, CELL - 8), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    shadow, (0, 0, 0, 120), shadow.get_rect(), border_radius=2
-                )
-                surface.blit(shadow, (sx + 6, sy + 6))
-                pygame.draw.rect(surface, col, r, border_radius=2)
-                pygame.draw.rect(surface, (0, 0, 0), r, 3, border_radius=2)
-                inner = r.inflate(-CELL // 6, -CELL // 6)
-                pygame.draw.rect(surface, (255, 255, 255), inner, 1, border_radius=2)
-            elif theme == "Wood":
-                # Shadow
-                shadow = pygame.Surface((CELL - 8, CELL - 8), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    shadow, (80, 60, 30, 100), shadow.get_rect(), border_radius=10
-                )
-                surface.blit(shadow, (sx + 6, sy + 8))
-                # Main fill
-                pygame.draw.rect(surface, col, r, border_radius=10)
-                # Wood grain texturing: draw a few random arcs/lines
-                grain_col = tuple(min(255, int(c * 1.15)) for c in col)
-                for offset in range(4, CELL-12, 7):
-                    pygame.draw.arc(surface, grain_col, r.move(0, offset//2), 0.2, 2.7, 1)
-                for offset in range(8, CELL-12, 11):
-                    pygame.draw.line(surface, grain_col, (r.left+4, r.top+offset), (r.right-4, r.top+offset), 1)
-                # Strong black outline
-                pygame.draw.rect(surface, (0, 0, 0), r, 4, border_radius=10)
-                # Highlight
-                highlight = pygame.Surface((CELL - 8, CELL - 8), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    highlight,
-                    (255, 255, 220, 80),
-                    (0, 0, CELL - 8, CELL // 3),
-                    border_radius=10,
-                )
-                surface.blit(highlight, (sx + 4, sy + 4))
-            elif theme == "Solarized":
-                shadow = pygame.Surface((CELL - 8, CELL - 8), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    shadow, (0, 43, 54, 120), shadow.get_rect(), border_radius=6
-                )
-                surface.blit(shadow, (sx + 5, sy + 7))
-                pygame.draw.rect(surface, col, r, border_radius=6)
-                pygame.draw.rect(surface, (253, 246, 227), r, 3, border_radius=6)
+        tile = tiles.get(col)
+        if tile is None:
+            tile = tiles[col] = bake_piece_tile(get_theme()["name"], col)
+        surface.blits([(tile, cell_to_screen(*cell)) for cell in pl["cells"]], doreturn=False)
         if i == highlight_idx:
             for cell in pl["cells"]:
                 sx, sy = cell_to_screen(*cell)
@@ -555,19 +557,7 @@ today = datetime.date.today()
 
 
 def get_today_labels():
-    month_str = today.strftime("%b").upper()
-    weekday_str = today.strftime("%a").upper()
-    month_cell = None
-    date_cell = None
-    weekday_cell = None
-    for pos, info in cell_label.items():
-        if info.get("type") == "month" and info.get("text") == month_str:
-            month_cell = pos
-        elif info.get("type") == "date" and info.get("text") == str(today.day):
-            date_cell = pos
-        elif info.get("type") == "weekday" and info.get("text") == weekday_str:
-            weekday_cell = pos
-    return month_cell, date_cell, weekday_cell
+    return get_date_labels(today)
 
 
 def is_only_today_visible():
@@ -605,50 +595,112 @@ def format_timer(elapsed):
     return f"Time: {mins}:{secs:05.2f}"
 
 
-# Confetti
-confetti_particles = []
+def format_solver_stats(stats):
+    """Lines for the solver stats overlay (S key)."""
+    if stats is None:
+        return ["No search stats (solutions came from the atlas or cache)"]
+    first = stats.first_solution_time
+    per = stats.time_per_solution
+    counts = f"Nodes {stats.nodes:,}   Dead ends {stats.dead_ends:,}"
+    if stats.covers:
+        counts += f"   Cover/uncover {stats.covers:,}/{stats.uncovers:,}"
+    timing = "First solution " + ("-" if first is None else f"{first * 1000:.1f} ms")
+    timing += "   Per solution " + ("-" if per is None else f"{per * 1000:.2f} ms")
+    branching = "Branching by depth: " + " ".join(f"{b:.1f}" for b in stats.mean_branching())
+    return [counts, timing, branching]
+
 
+def format_solver_progress(progress):
+    """One-line summary of a running search, from its latest PROGRESS message."""
+    if progress is None:
+        return "Starting search..."
+    line = f"{progress['solutions']} found   {progress['nodes']:,} nodes   {progress['elapsed']:.1f} s"  # noqa: E501
+    if progress["remaining"] is not None:
+        line += f"   ~{progress['remaining']:.1f} s left"
+    return line
 
-def spawn_confetti(surface, n=120):
-    confetti_particles.clear()
+
+# Confetti
+CONFETTI_PARTICLES = 2000
+CONFETTI_COLORS = [
+    (255, 200, 80),
+    (255, 120, 120),
+    (120, 200, 255),
+    (180, 255, 120),
+    (255, 180, 255),
+    (255, 255, 255),
+]
+CONFETTI_SIZES = range(4, 11)
+
+
+class Confetti:
+    """Confetti particles as parallel numpy arrays, one slot per particle.
+
+    Moving, ageing and respawning are whole-array operations, and drawing
+    is a single blits() of prebuilt squares: `sprite` indexes `sprites`,
+    one square per (color, size).
+    """
+
+    def __init__(self, n, w, h, rng=None):
+        self.rng = rng or np.random.default_rng()
+        self.x = np.zeros(n, np.float32)
+        self.y = np.zeros(n, np.float32)
+        self.dx = np.zeros(n, np.float32)
+        self.dy = np.zeros(n, np.float32)
+        self.ttl = np.zeros(n, np.int16)
+        self.sprite = self.rng.integers(0, len(CONFETTI_COLORS) * len(CONFETTI_SIZES), n)
+        self.sprites = []
+        for color in CONFETTI_COLORS:
+            for size in CONFETTI_SIZES:
+                square = pygame.Surface((size, size))
+                square.fill(color)
+                self.sprites.append(square)
+        self.respawn(np.ones(n, bool), w, h)
+
+    def respawn(self, mask, w, h):
+        """Start the particles in `mask` again somewhere above the window."""
+        k = int(np.count_nonzero(mask))
+        if not k:
+            return
+        rng = self.rng
+        self.x[mask] = rng.integers(0, w, k, endpoint=True)
+        self.y[mask] = rng.integers(-h // 2, 0, k, endpoint=True)
+        self.dx[mask] = rng.uniform(-1, 1, k)
+        self.dy[mask] = rng.uniform(2, 5, k)
+        self.ttl[mask] = rng.integers(30, 80, k, endpoint=True)
+
+    def update(self, w, h):
+        self.x += self.dx
+        self.y += self.dy
+        self.ttl -= 1
+        self.respawn((self.y > h) | (self.ttl <= 0), w, h)
+
+    def draw(self, surface):
+        # Particles start up to half a window above the top; most of them
+        # are not on screen yet, so pick the visible ones before blitting.
+        w, h = surface.get_size()
+        edge = -max(CONFETTI_SIZES)
+        visible = (self.y > edge) & (self.y < h) & (self.x > edge) & (self.x < w)
+        sprites = self.sprites
+        positions = np.stack((self.x[visible], self.y[visible]), axis=1).astype(np.int32).tolist()
+        keys = self.sprite[visible].tolist()
+        surface.blits(zip([sprites[i] for i in keys], positions), doreturn=False)
+
+
+confetti = None
+
+
+def spawn_confetti(surface, n=CONFETTI_PARTICLES):
+    global confetti
     w, h = surface.get_size()
-    for _ in range(n):
-        x = random.randint(0, w)
-        y = random.randint(-h // 2, 0)
-        dx = random.uniform(-1, 1)
-        dy = random.uniform(2, 5)
-        color = random.choice(
-            [
-                (255, 200, 80),
-                (255, 120, 120),
-                (120, 200, 255),
-                (180, 255, 120),
-                (255, 180, 255),
-                (255, 255, 255),
-            ]
-        )
-        size = random.randint(4, 10)
-        confetti_particles.append(
-            {"x": x, "y": y, "dx": dx, "dy": dy, "color": color, "size": size, "ttl": random.randint(30, 80)}  # noqa: E501
-        )
+    confetti = Confetti(n, w, h)
 
 
 def update_confetti(surface):
-    w, h = surface.get_size()
-    for p in confetti_particles:
-        p["x"] += p["dx"]
-        p["y"] += p["dy"]
-        p["ttl"] -= 1
-        if p["y"] > h or p["ttl"] <= 0:
-            p["x"] = random.randint(0, w)
-            p["y"] = random.randint(-h // 2, 0)
-            p["dx"] = random.uniform(-1, 1)
-            p["dy"] = random.uniform(2, 5)
-            p["ttl"] = random.randint(30, 80)
-    for p in confetti_particles:
-        pygame.draw.rect(
-            surface, p["color"], (int(p["x"]), int(p["y"]), p["size"], p["size"])
-        )
+    if confetti is None:
+        return
+    confetti.update(*surface.get_size())
+    confetti.draw(surface)
 
 
 def draw_win_screen(surface):
@@ -656,16 +708,14 @@ def draw_win_screen(surface):
     overlay.fill((0, 0, 0, 180))
     surface.blit(overlay, (0, 0))
     update_confetti(surface)
-    font = create_scaled_font(FONT_SCALE_WIN_TITLE)
     msg = f"You solved it! {today.strftime('%B %d')} is visible!"
-    text_surf = font.render(msg, True, (255, 255, 200))
+    text_surf = render_text(msg, FONT_SCALE_WIN_TITLE, (255, 255, 200))
     rect = text_surf.get_rect(
         center=(surface.get_width() // 2, surface.get_height() // 2)
     )
     surface.blit(text_surf, rect)
-    font2 = create_scaled_font(FONT_SCALE_WIN_SUBTITLE)
     msg2 = "Press ESC to continue"
-    text2 = font2.render(msg2, True, (255, 255, 200))
+    text2 = render_text(msg2, FONT_SCALE_WIN_SUBTITLE, (255, 255, 200))
     rect2 = text2.get_rect(
         center=(surface.get_width() // 2, surface.get_height() // 2 + int(CELL * 1.2))
     )
@@ -673,8 +723,7 @@ def draw_win_screen(surface):
     if timer_started and timer_start_time is not None and timer_end_time is not None:
         elapsed = calculate_elapsed_time(timer_start_time, timer_end_time)
         timer_msg = format_timer(elapsed)
-        font_timer = create_scaled_font(FONT_SCALE_WIN_TIMER)
-        timer_surf = font_timer.render(timer_msg, True, (255, 255, 200))
+        timer_surf = render_text(timer_msg, FONT_SCALE_WIN_TIMER, (255, 255, 200))
         esc_y = surface.get_height() // 2 + int(CELL * 1.2)
         timer_rect = timer_surf.get_rect(
             center=(surface.get_width() // 2, esc_y + 30 + timer_surf.get_height() // 2)
@@ -689,282 +738,129 @@ timer_started = False
 timer_start_time = None
 timer_end_time = None
 
-# ------------------ DLX (Algorithm X) ------------------
-class DLXNode:
-    __slots__ = ("L", "R", "U", "D", "C", "row_id")
-
-    def __init__(self):
-        self.L = self.R = self.U = self.D = self
-        self.C = None
-        self.row_id = None
-
-
-class DLXColumn(DLXNode):
-    __slots__ = ("name", "size")
-
-    def __init__(self, name):
-        super().__init__()
-        self.name = name
-        self.size = 0
-
-
-class DLX:
-    def __init__(self):
-        self.header = DLXColumn("header")
-        self.columns = []
-        self.solution = []
-        self.time_limit = None
-        self.start_time = None
-        self.solutions = []
-        self.max_solutions = None
-
-    def add_column(self, name):
-        c = DLXColumn(name)
-        c.R = self.header
-        c.L = self.header.L
-        self.header.L.R = c
-        self.header.L = c
-        self.columns.append(c)
-        return c
-
-    def add_row(self, row_id, col_objs):
-        first = None
-        for c in col_objs:
-            n = DLXNode()
-            n.C = c
-            n.row_id = row_id
-            n.U = c.U
-            n.D = c
-            c.U.D = n
-            c.U = n
-            c.size += 1
-            if first is None:
-                first = n
-                n.R = n.L = n
-            else:
-                n.R = first
-                n.L = first.L
-                first.L.R = n
-                first.L = n
-
-    def cover(self, c):
-        c.R.L = c.L
-        c.L.R = c.R
-        i = c.D
-        while i != c:
-            j = i.R
-            while j != i:
-                j.D.U = j.U
-                j.U.D = j.D
-                j.C.size -= 1
-                j = j.R
-            i = i.D
-
-    def uncover(self, c):
-        i = c.U
-        while i != c:
-            j = i.L
-            while j != i:
-                j.C.size += 1
-                j.D.U = j
-                j.U.D = j
-                j = j.L
-            i = i.U
-        c.R.L = c
-        c.L.R = c
-
-    def choose_column(self):
-        c = self.header.R
-        best = c
-        while c != self.header:
-            if c.size < best.size:
-                best = c
-            c = c.R
-        return best
-
-    def search(self):
-        if self.time_limit is not None and (time.time() - self.start_time) > self.time_limit:  # noqa: E501
-            return None
-        if self.header.R == self.header:
-            return list(self.solution)
-        c = self.choose_column()
-        if c.size == 0:
-            return None
-        self.cover(c)
-        r = c.D
-        while r != c:
-            self.solution.append(r)
-            j = r.R
-            while j != r:
-                self.cover(j.C)
-                j = j.R
-            out = self.search()
-            if out is not None:
-                return out
-            j = r.L
-            while j != r:
-                self.uncover(j.C)
-                j = j.L
-            self.solution.pop()
-            r = r.D
-            if self.time_limit is not None and (time.time() - self.start_time) > self.time_limit:  # noqa: E501
-                return None
-        self.uncover(c)
-        return None
-
-    def solve(self, time_limit=None):
-        self.time_limit = time_limit
-        self.start_time = time.time()
-        return self.search()
-
-    def _search_all(self):
-        if self.time_limit is not None and (time.time() - self.start_time) > self.time_limit:  # noqa: E501
-            return
-        if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:
-            return
-        if self.header.R == self.header:
-            self.solutions.append(list(self.solution))
-            return
-        c = self.choose_column()
-        if c.size == 0:
-            return
-        self.cover(c)
-        r = c.D
-        while r != c:
-            if self.time_limit is not None and (time.time() - self.start_time) > self.time_limit:  # noqa: E501
-                break
-            if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:  # noqa: E501
-                break
-            self.solution.append(r)
-            j = r.R
-            while j != r:
-                self.cover(j.C)
-                j = j.R
-            self._search_all()
-            j = r.L
-            while j != r:
-                self.uncover(j.C)
-                j = j.L
-            self.solution.pop()
-            r = r.D
-        self.uncover(c)
-
-    def solve_all(self, time_limit=None, max_solutions=None):
-        self.time_limit = time_limit
-        self.max_solutions = max_solutions
-        self.start_time = time.time()
-        self.solutions = []
-        self.solution = []
-        self._search_all()
-        return self.solutions
-
-
-# ------------------ Solver: Build Exact Cover ------------------
-def all_piece_orientations(base_cells):
-    seen = set()
-    for flip in [False, True]:
-        for rot in range(4):
-            oc = tuple(sorted(normalize(oriented_cells(base_cells, rot, flip))))
-            if oc not in seen:
-                seen.add(oc)
-                yield (rot, flip, [c for c in oc])
-
-
-def generate_placements(forbidden):
-    n = len(pieces)
-    per_piece = []
-    for pid in range(n):
-        base = pieces[pid]["cells"]
-        piece_list = []
-        ori_list = list(all_piece_orientations(base))
-        for rot, flip, shape in ori_list:
-            maxx = max(x for x, y in shape)
-            maxy = max(y for x, y in shape)
-            for x0 in range(GRID_W - maxx):
-                for y0 in range(GRID_H - maxy):
-                    abs_cells = [(x0 + x, y0 + y) for (x, y) in shape]
-                    if any(c not in board_mask for c in abs_cells):
-                        continue
-                    if any(c in forbidden for c in abs_cells):
-                        continue
-                    piece_list.append((pid, rot, flip, x0, y0, tuple(abs_cells)))
-        per_piece.append(piece_list)
-    return per_piece
-
-
-def dlx_build_and_solve_all(forbidden, time_limit=10.0, max_solutions=200):
-    to_cover = sorted(set(board_mask) - set(forbidden))
-    dlx = DLX()
-    cell_col = {}
-    for cell in to_cover:
-        cell_col[cell] = dlx.add_column(("C", cell))
-    piece_col = {}
-    for pid in range(len(pieces)):
-        piece_col[pid] = dlx.add_column(("P", pid))
-
-    placements = generate_placements(forbidden)
-
-    row_map = []
-    for pid, plist in enumerate(placements):
-        for (pid, rot, flip, x0, y0, abs_cells) in plist:
-            cols = [piece_col[pid]] + [cell_col[c] for c in abs_cells if c in cell_col]
-            if len(cols) == 1 + len(abs_cells):
-                row_id = len(row_map)
-                dlx.add_row(row_id, cols)
-                row_map.append((pid, rot, flip, x0, y0, abs_cells))
-
-    sols_nodes = dlx.solve_all(time_limit=time_limit, max_solutions=max_solutions)
-    if not sols_nodes:
-        return []
-
-    results = []
-    for sol_nodes in sols_nodes:
-        chosen_rows = []
-        for node in sol_nodes:
-            chosen_rows.append(row_map[node.row_id])
-        chosen_rows.sort(key=lambda t: t[0])
-        out = []
-        for (pid, rot, flip, x0, y0, abs_cells) in chosen_rows:
-            out.append((x0, y0, rot, flip, list(abs_cells)))
-        results.append(out)
-    return results
-
-
-# ------------------ Threaded Auto-Solver using DLX ------------------
+# ------------------ Auto-Solver in a worker process ------------------
+# The search runs in a child process so it never holds the GIL the render
+# loop needs; poll_auto_solve() drains its queue once per frame. Fork is
+# used on Linux only (instant start, nothing re-imported): on macOS forking
+# after the video subsystem is up can crash the child, so other platforms
+# keep their default start method and re-import this module, which opens
+# no window until main() runs.
+SOLVER_CONTEXT = (
+    multiprocessing.get_context("fork")
+    if sys.platform.startswith("linux")
+    else multiprocessing.get_context()
+)
+# How long a cancelled child gets to stop on its own before it is terminated.
+SOLVER_JOIN_TIMEOUT = 0.5
 solving = False
-solver_thread = None
+solver_process = None
+solver_queue = None
+solver_cancel = None
+# Finished or cancelled solver processes not yet joined, each with the time
+# after which reap_solver_processes() terminates it.
+retired_solvers = []
 
 solver_solutions = []
 solver_index = 0
+solver_stats = None
+solver_progress = None
+show_solver_stats = False
 auto_solve_active = False
 
 
-def threaded_auto_solve():
-    global solving, solver_solutions, solver_index
-    month_cell, date_cell, weekday_cell = get_today_labels()
-    forbidden = {month_cell, date_cell, weekday_cell}
-    if None in forbidden:
-        solver_solutions = []
-        solving = False
-        return
-    results = dlx_build_and_solve_all(forbidden, time_limit=10.0, max_solutions=500)
-    if not results:
-        solver_solutions = []
-    else:
-        solver_solutions = results
-        solver_index = 0
+def retire_solver_process():
+    """Forget the current solver process; reap_solver_processes() joins it later."""
+    global solver_process, solver_queue, solver_cancel
+    if solver_process is not None:
+        retired_solvers.append((solver_process, time.perf_counter() + SOLVER_JOIN_TIMEOUT))
+    solver_process = solver_queue = solver_cancel = None
+
+
+def reap_solver_processes():
+    """Join retired solver processes that have exited, without blocking."""
+    now = time.perf_counter()
+    for entry in list(retired_solvers):
+        process, deadline = entry
+        if process.is_alive() and now >= deadline:
+            process.terminate()
+        process.join(0)
+        if not process.is_alive():
+            retired_solvers.remove(entry)
+
+
+def poll_auto_solve():
+    """Take whatever the solver process has sent since the last frame."""
+    global solving, solver_stats, solver_progress
+    reap_solver_processes()
+    while solver_queue is not None:
+        try:
+            msg = solver_queue.get_nowait()
+        except queue.Empty:
+            if solver_process.is_alive():
+                return
+            # Exited without DONE (e.g. the worker raised): whatever it sent
+            # is already in the pipe, so one more look, then stop waiting.
+            try:
+                msg = solver_queue.get_nowait()
+            except queue.Empty:
+                solving = False
+                solver_progress = None
+                retire_solver_process()
+                return
+        if msg[0] == SOLUTIONS:
+            # The first solution goes on screen right away (solving = False
+            # lets the main loop apply it) while the rest keep arriving.
+            solver_solutions.extend(decode_solutions(msg[1]))
+            solving = False
+        elif msg[0] == PROGRESS:
+            solver_progress = msg[1]
+        else:
+            solving = False
+            solver_stats = msg[2]
+            solver_progress = None
+            retire_solver_process()
+
+
+def cancel_auto_solve():
+    """Stop the in-flight Auto-Solve search, if any, without waiting for it."""
+    global solving, solver_progress
+    if solver_cancel is not None:
+        solver_cancel.cancel()
+    retire_solver_process()
+    solver_progress = None
     solving = False
 
 
 def auto_solve_today():
-    global solving, solver_thread, solver_solutions, auto_solve_active
-    if solving:
+    global solving, solver_process, solver_queue, solver_solutions, solver_index, solver_cancel, auto_solve_active, solver_stats  # noqa: E501
+    cancel_auto_solve()
+    solver_solutions = []
+    solver_index = 0
+    solver_stats = None
+    auto_solve_active = False
+    forbidden = set(get_today_labels())
+    if None in forbidden:
         return
     solving = True
+    solver_queue = SOLVER_CONTEXT.Queue()
+    solver_cancel = ProcessCancelToken(SOLVER_CONTEXT)
+    solver_process = SOLVER_CONTEXT.Process(
+        target=solve_worker, args=(forbidden, solver_queue, solver_cancel), daemon=True
+    )
+    solver_process.start()
+
+
+def check_date_change():
+    """Follow the calendar past midnight; drops solutions for the old date."""
+    global today, solver_solutions, auto_solve_active
+    now = datetime.date.today()
+    if now == today:
+        return False
+    today = now
+    cancel_auto_solve()
     solver_solutions = []
     auto_solve_active = False
-    solver_thread = threading.Thread(target=threaded_auto_solve, daemon=True)
-    solver_thread.start()
+    return True
 
 
 # ------------------ PLACEMENT VALIDATION ------------------
@@ -998,6 +894,67 @@ def apply_solution(sol):
     update_placed_cells()
 
 
+# ------------------ FRAME SCHEDULING ------------------
+# A frame is only drawn when frame_snapshot() differs from the last one
+# shown, and only the regions that changed are pushed to the window. With
+# nothing but the timer changing, the loop waits for input at IDLE_FPS
+# instead of spinning at ACTIVE_FPS.
+ACTIVE_FPS = 60
+IDLE_FPS = 10
+frame_state = None
+hud_rects = {}
+
+
+def hud_texts():
+    """Text of each HUD element (None when hidden), as the next frame shows it."""
+    elapsed = calculate_elapsed_time(timer_start_time, timer_end_time) if timer_started else 0.0
+    texts = {"timer": format_timer(elapsed), "index": None, "progress": None, "stats": None}
+    if auto_solve_active and solver_solutions:
+        texts["index"] = f"Solution {solver_index + 1}/{len(solver_solutions)}  (← / →)"
+        if solver_process is not None:
+            # Still searching: the solution count keeps growing.
+            texts["progress"] = format_solver_progress(solver_progress)
+        if show_solver_stats:
+            texts["stats"] = tuple(format_solver_stats(solver_stats))
+    return texts
+
+
+def frame_snapshot():
+    """(scene, pieces, HUD texts): everything that decides what a frame shows."""
+    scene = (screen.get_size(), theme_idx, CELL, win_mode, solving,
+             solver_progress if solving else None)
+    piece_state = tuple((tuple(pl["cells"]), i == selected_idx) for i, pl in enumerate(placed))
+    return scene, piece_state, hud_texts()
+
+
+def dirty_rects(prev, cur, prev_hud_rects, cur_hud_rects):
+    """Window regions that differ between two frame snapshots.
+
+    A new scene (size, theme, overlays) or the animated win screen
+    redraws everything; otherwise it is the old and new cells of every
+    piece that moved, and the old and new rects of every HUD text that
+    changed.
+    """
+    if prev is None or prev[0] != cur[0] or win_mode or len(prev[1]) != len(cur[1]):
+        return [screen.get_rect()]
+    rects = []
+    for old, new in zip(prev[1], cur[1]):
+        if old != new:
+            rects.extend(pygame.Rect(cell_to_screen(*c), (CELL, CELL)) for c in old[0] + new[0])
+    for name, text in cur[2].items():
+        if text != prev[2][name]:
+            rects.extend(r for r in (prev_hud_rects.get(name), cur_hud_rects.get(name)) if r)
+    return rects
+
+
+def wait_for_events(timeout_ms):
+    """Sleep until an event arrives or `timeout_ms` passes; returns the pending events."""
+    first = pygame.event.wait(timeout_ms)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+
 # ------------------ MAIN LOOP ------------------
 running = True
 win_mode = False
@@ -1006,128 +963,170 @@ timer_started = False
 timer_start_time = None
 timer_end_time = None
 
-while running:
-    dt = clock.tick(60)
-    events = pygame.event.get()
-    for ev in events:
-        if ev.type == pygame.QUIT:
-            running = False
-
-        elif ev.type == pygame.VIDEORESIZE:
-            new_w, new_h = ev.w, ev.h
-            screen = pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
-            recompute_palette_layout()
-
-        elif ev.type == pygame.KEYDOWN:
-            if win_mode:
-                if ev.key == pygame.K_ESCAPE:
-                    for pl in placed:
-                        pl["pos"] = pl["home"]
-                        pl["rot"] = 0
-                        pl["flip"] = False
-                    update_placed_cells()
-                    win_mode = False
-                    win_delay_frames = 0
-                    timer_started = False
-                    timer_start_time = None
-                    timer_end_time = None
-            else:
-                # Theme switching
-                if ev.key == pygame.K_t:
-                    theme_idx = (theme_idx + 1) % len(THEMES)
-                    apply_theme()
-                    update_piece_colors()
-                    recompute_palette_layout()
-                # Auto-solve navigation
-                elif auto_solve_active and solver_solutions:
-                    if ev.key == pygame.K_LEFT:
-                        solver_index = (solver_index - 1) % len(solver_solutions)
-                        apply_solution(solver_solutions[solver_index])
-                    elif ev.key == pygame.K_RIGHT:
-                        solver_index = (solver_index + 1) % len(solver_solutions)
-                        apply_solution(solver_solutions[solver_index])
-                # Deselect and piece manipulation
-                if ev.key == pygame.K_ESCAPE:
-                    selected_idx = None
-                elif selected_idx is not None:
-                    if ev.key == pygame.K_r:
-                        placed[selected_idx]["rot"] = (placed[selected_idx]["rot"] + 1) % 4
-                        update_placed_cells()
-                    elif ev.key == pygame.K_f:
-                        placed[selected_idx]["flip"] = not placed[selected_idx]["flip"]
-                        update_placed_cells()
-
-        elif not win_mode and ev.type == pygame.MOUSEBUTTONDOWN:
-            if ev.button == 3:
-                gx, gy = screen_to_cell(*ev.pos)
-                found = None
-                for i in range(len(placed) - 1, -1, -1):
-                    if (gx, gy) in placed[i]["cells"]:
-                        found = i
-                        break
-                if found is not None:
-                    placed[found]["pos"] = placed[found]["home"]
-                    placed[found]["rot"] = 0
-                    placed[found]["flip"] = False
-                    update_placed_cells()
-                    selected_idx = None
-                    mouse_dragging = False
-                    pre_drag_pos = None
-                continue
-
-            if ev.button == 1:
-                try:
-                    if button_rect.collidepoint(ev.pos):
+def main():
+    global screen, theme_idx, selected_idx, mouse_offset, mouse_dragging, pre_drag_pos
+    global solver_solutions, solver_index, auto_solve_active, show_solver_stats
+    global win_mode, win_delay_frames, timer_started, timer_start_time, timer_end_time
+    global running, frame_state, hud_rects
+    init_window()
+    busy = True
+    while running:
+        if busy:
+            clock.tick(ACTIVE_FPS)
+            events = pygame.event.get()
+        else:
+            events = wait_for_events(1000 // IDLE_FPS)
+            clock.tick()
+        check_date_change()
+        poll_auto_solve()
+        for ev in events:
+            if ev.type == pygame.QUIT:
+                running = False
+
+            elif ev.type == pygame.WINDOWEXPOSED:
+                frame_state = None  # the window contents may be gone; redraw all of it
+
+            elif ev.type == pygame.VIDEORESIZE:
+                new_w, new_h = ev.w, ev.h
+                screen = pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
+                recompute_palette_layout()
+
+            elif ev.type == pygame.KEYDOWN:
+                if win_mode:
+                    if ev.key == pygame.K_ESCAPE:
                         for pl in placed:
                             pl["pos"] = pl["home"]
                             pl["rot"] = 0
                             pl["flip"] = False
                         update_placed_cells()
-                        selected_idx = None
-                        mouse_dragging = False
-                        pre_drag_pos = None
-                        timer_started = False
-                        timer_start_time = None
-                        timer_end_time = None
-                        solver_solutions = []
-                        auto_solve_active = False
-                        continue
-                    if autosolve_button_rect.collidepoint(ev.pos):
+                        win_mode = False
+                        win_delay_frames = 0
                         timer_started = False
                         timer_start_time = None
                         timer_end_time = None
-                        auto_solve_today()
+                else:
+                    # Theme switching
+                    if ev.key == pygame.K_t:
+                        theme_idx = (theme_idx + 1) % len(THEMES)
+                        apply_theme()
+                        update_piece_colors()
+                        recompute_palette_layout()
+                    elif ev.key == pygame.K_s:
+                        show_solver_stats = not show_solver_stats
+                    # Auto-solve navigation
+                    elif auto_solve_active and solver_solutions:
+                        if ev.key == pygame.K_LEFT:
+                            solver_index = (solver_index - 1) % len(solver_solutions)
+                            apply_solution(solver_solutions[solver_index])
+                        elif ev.key == pygame.K_RIGHT:
+                            solver_index = (solver_index + 1) % len(solver_solutions)
+                            apply_solution(solver_solutions[solver_index])
+                    # Deselect and piece manipulation
+                    if ev.key == pygame.K_ESCAPE:
+                        selected_idx = None
+                    elif selected_idx is not None:
+                        if ev.key == pygame.K_r:
+                            placed[selected_idx]["rot"] = (placed[selected_idx]["rot"] + 1) % 4
+                            update_placed_cells()
+                        elif ev.key == pygame.K_f:
+                            placed[selected_idx]["flip"] = not placed[selected_idx]["flip"]
+                            update_placed_cells()
+
+            elif not win_mode and ev.type == pygame.MOUSEBUTTONDOWN:
+                if ev.button == 3:
+                    gx, gy = screen_to_cell(*ev.pos)
+                    found = None
+                    for i in range(len(placed) - 1, -1, -1):
+                        if (gx, gy) in placed[i]["cells"]:
+                            found = i
+                            break
+                    if found is not None:
+                        placed[found]["pos"] = placed[found]["home"]
+                        placed[found]["rot"] = 0
+                        placed[found]["flip"] = False
+                        update_placed_cells()
                         selected_idx = None
                         mouse_dragging = False
                         pre_drag_pos = None
-                        continue
-                except NameError:
-                    pass
+                    continue
+
+                if ev.button == 1:
+                    try:
+                        if button_rect.collidepoint(ev.pos):
+                            for pl in placed:
+                                pl["pos"] = pl["home"]
+                                pl["rot"] = 0
+                                pl["flip"] = False
+                            update_placed_cells()
+                            selected_idx = None
+                            mouse_dragging = False
+                            pre_drag_pos = None
+                            timer_started = False
+                            timer_start_time = None
+                            timer_end_time = None
+                            cancel_auto_solve()
+                            solver_solutions = []
+                            auto_solve_active = False
+                            continue
+                        if autosolve_button_rect.collidepoint(ev.pos):
+                            timer_started = False
+                            timer_start_time = None
+                            timer_end_time = None
+                            auto_solve_today()
+                            selected_idx = None
+                            mouse_dragging = False
+                            pre_drag_pos = None
+                            continue
+                    except NameError:
+                        pass
+
+                    gx, gy = screen_to_cell(*ev.pos)
+                    found = None
+                    for i in range(len(placed) - 1, -1, -1):
+                        if (gx, gy) in placed[i]["cells"]:
+                            found = i
+                            break
+                    if found is not None:
+                        selected_idx = found
+                        mouse_dragging = True
+                        pre_drag_pos = placed[selected_idx]["pos"]
+                        mouse_offset = (
+                            gx - placed[selected_idx]["pos"][0],
+                            gy - placed[selected_idx]["pos"][1],
+                        )
+                        auto_solve_active = False
+                        if not timer_started:
+                            timer_started = True
+                            timer_start_time = time.time()
+                            timer_end_time = None
+                    else:
+                        selected_idx = None
 
-                gx, gy = screen_to_cell(*ev.pos)
-                found = None
-                for i in range(len(placed) - 1, -1, -1):
-                    if (gx, gy) in placed[i]["cells"]:
-                        found = i
-                        break
-                if found is not None:
-                    selected_idx = found
-                    mouse_dragging = True
-                    pre_drag_pos = placed[selected_idx]["pos"]
-                    mouse_offset = (
-                        gx - placed[selected_idx]["pos"][0],
-                        gy - placed[selected_idx]["pos"][1],
+            elif not win_mode and ev.type == pygame.MOUSEBUTTONUP and ev.button == 1:
+                if mouse_dragging and selected_idx is not None:
+                    gx, gy = screen_to_cell(*ev.pos)
+                    new_pos = (gx - mouse_offset[0], gy - mouse_offset[1])
+                    pid = placed[selected_idx]["pid"]
+                    oc = oriented_cells(
+                        pieces[pid]["cells"],
+                        placed[selected_idx]["rot"],
+                        placed[selected_idx]["flip"],
                     )
-                    auto_solve_active = False
-                    if not timer_started:
-                        timer_started = True
-                        timer_start_time = time.time()
-                        timer_end_time = None
-                else:
-                    selected_idx = None
-
-        elif not win_mode and ev.type == pygame.MOUSEBUTTONUP and ev.button == 1:
-            if mouse_dragging and selected_idx is not None:
+                    candidate = [(new_pos[0] + x, new_pos[1] + y) for (x, y) in oc]
+                    if placement_valid_for_cells(candidate, selected_idx):
+                        placed[selected_idx]["pos"] = new_pos
+                        placed[selected_idx]["cells"] = candidate
+                    else:
+                        placed[selected_idx]["pos"] = pre_drag_pos
+                        update_placed_cells()
+                mouse_dragging = False
+
+            elif (
+                not win_mode
+                and ev.type == pygame.MOUSEMOTION
+                and mouse_dragging
+                and selected_idx is not None
+            ):
                 gx, gy = screen_to_cell(*ev.pos)
                 new_pos = (gx - mouse_offset[0], gy - mouse_offset[1])
                 pid = placed[selected_idx]["pid"]
@@ -1136,153 +1135,146 @@ while running:
                     placed[selected_idx]["rot"],
                     placed[selected_idx]["flip"],
                 )
-                candidate = [(new_pos[0] + x, new_pos[1] + y) for (x, y) in oc]
-                if placement_valid_for_cells(candidate, selected_idx):
-                    placed[selected_idx]["pos"] = new_pos
-                    placed[selected_idx]["cells"] = candidate
-                else:
-                    placed[selected_idx]["pos"] = pre_drag_pos
-                    update_placed_cells()
-            mouse_dragging = False
-
-        elif (
-            not win_mode
-            and ev.type == pygame.MOUSEMOTION
-            and mouse_dragging
-            and selected_idx is not None
-        ):
-            gx, gy = screen_to_cell(*ev.pos)
-            new_pos = (gx - mouse_offset[0], gy - mouse_offset[1])
-            pid = placed[selected_idx]["pid"]
-            oc = oriented_cells(
-                pieces[pid]["cells"],
-                placed[selected_idx]["rot"],
-                placed[selected_idx]["flip"],
-            )
-            placed[selected_idx]["pos"] = new_pos
-            placed[selected_idx]["cells"] = [
-                (new_pos[0] + x, new_pos[1] + y) for (x, y) in oc
-            ]
-
-    # Draw
-    screen.fill(BG)
-    board_y_offset = get_board_y_offset()
-    board_surf = pygame.Surface((GRID_W * CELL, GRID_H * CELL), pygame.SRCALPHA)
-    draw_board(board_surf, y_offset=0)
-
-    # Removed the board shadow that caused the darker outline around the grid.
-    # (We only blit the board itself.)
-    screen.blit(board_surf, (0, board_y_offset))
-
-    # Dark area and labels (kept; constrained to the board width)
-    dark_area_height = int(CELL * 1.3)
-    dark_area_y = board_y_offset + GRID_H * CELL + 8 + int(CELL * 0.2)
-    pygame.draw.rect(
-        screen, BG, (0, dark_area_y, GRID_W * CELL, dark_area_height), border_radius=12
-    )
-    theme_label_font = create_scaled_font(FONT_SCALE_THEME_LABEL, bold=True)
-    theme_name = get_theme()["name"]
-    label_surf = theme_label_font.render(
-        f"Theme: {theme_name} (T to change)", True, TEXT_COL
-    )
-    controls_font = create_scaled_font(FONT_SCALE_CONTROLS)
-    controls_text = (
-        "R: Rotate   F: Flip   ESC: Deselect/Reset   \nRight mouse click: Reset singular piece   ←/→: Browse Auto-Solve"
-    )
-    text_y = dark_area_y + 10
-    screen.blit(label_surf, (12, text_y))
-    # Render controls text on two lines
-    controls_lines = controls_text.split("\n")
-    y_offset = text_y + label_surf.get_height() + 4
-    for line in controls_lines:
-        controls_surf = controls_font.render(line, True, TEXT_COL)
-        screen.blit(controls_surf, (12, y_offset))
-        y_offset += controls_surf.get_height() + 2
-
-    # Buttons
-    button_w = int(CELL * 4.5)
-    button_h = int(CELL * 0.9)
-    button_x = (GRID_W * CELL - button_w) // 2
-    button_y = text_y + label_surf.get_height() + 4 + controls_surf.get_height() + int(
-        CELL * 0.5
-    )
-    button_rect = pygame.Rect(button_x, button_y, button_w, button_h)
-    btn_bg, btn_border, btn_text_col = get_button_theme_colors("normal")
-    draw_button(screen, button_rect, "Reset Board", btn_bg, btn_border, btn_text_col)
+                placed[selected_idx]["pos"] = new_pos
+                placed[selected_idx]["cells"] = [
+                    (new_pos[0] + x, new_pos[1] + y) for (x, y) in oc
+                ]
+
+        # Apply first solver result once ready (no winner screen)
+        if not solving and solver_solutions and not auto_solve_active:
+            apply_solution(solver_solutions[solver_index])
+            auto_solve_active = True
+            timer_started = False
+            timer_start_time = None
+            timer_end_time = None
+
+        # Win / timer
+        if not win_mode:
+            if not auto_solve_active and is_only_today_visible():
+                if win_delay_frames == 0:
+                    win_delay_frames = WIN_DELAY
+            else:
+                win_delay_frames = 0 if auto_solve_active else win_delay_frames
+            if win_delay_frames > 0:
+                win_delay_frames -= 1
+                if win_delay_frames == 0 and not auto_solve_active:
+                    win_mode = True
+                    spawn_confetti(screen)
+                    if timer_started and timer_end_time is None:
+                        timer_end_time = time.time()
+
+        # Draw
+        snapshot = frame_snapshot()
+        busy = bool(events) or mouse_dragging or solving or solver_process is not None or win_mode or win_delay_frames > 0  # noqa: E501
+        if snapshot == frame_state and not win_mode:
+            continue
+        prev_hud_rects, hud_rects = hud_rects, {}
+        texts = snapshot[2]
+        screen.fill(BG)
+        board_y_offset = get_board_y_offset()
+
+        # Removed the board shadow that caused the darker outline around the grid.
+        # (We only blit the board itself.)
+        screen.blit(get_board_layer(), (0, board_y_offset))
+
+        # Dark area and labels (kept; constrained to the board width)
+        dark_area_height = int(CELL * 1.3)
+        dark_area_y = board_y_offset + GRID_H * CELL + 8 + int(CELL * 0.2)
+        pygame.draw.rect(
+            screen, BG, (0, dark_area_y, GRID_W * CELL, dark_area_height), border_radius=12
+        )
+        theme_name = get_theme()["name"]
+        label_surf = render_text(
+            f"Theme: {theme_name} (T to change)", FONT_SCALE_THEME_LABEL, TEXT_COL, bold=True
+        )
+        controls_text = (
+            "R: Rotate   F: Flip   ESC: Deselect/Reset   \nRight mouse click: Reset singular piece   ←/→: Browse Auto-Solve   S: Stats"
+        )
+        text_y = dark_area_y + 10
+        screen.blit(label_surf, (12, text_y))
+        # Render controls text on two lines
+        controls_lines = controls_text.split("\n")
+        y_offset = text_y + label_surf.get_height() + 4
+        for line in controls_lines:
+            controls_surf = render_text(line, FONT_SCALE_CONTROLS, TEXT_COL)
+            screen.blit(controls_surf, (12, y_offset))
+            y_offset += controls_surf.get_height() + 2
+
+        # Buttons
+        button_w = int(CELL * 4.5)
+        button_h = int(CELL * 0.9)
+        button_x = (GRID_W * CELL - button_w) // 2
+        button_y = text_y + label_surf.get_height() + 4 + controls_surf.get_height() + int(
+            CELL * 0.5
+        )
+        button_rect = pygame.Rect(button_x, button_y, button_w, button_h)
+        btn_bg, btn_border, btn_text_col = get_button_theme_colors("normal")
+        draw_button(screen, button_rect, "Reset Board", btn_bg, btn_border, btn_text_col)
 
-    autosolve_button_y = button_y + button_h + int(CELL * 0.3)
-    autosolve_button_rect = pygame.Rect(
-        button_x, autosolve_button_y, button_w, button_h
-    )
-    auto_bg, auto_border, auto_text_col = get_button_theme_colors("autosolve")
-    draw_button(screen, autosolve_button_rect, "Auto-Solve", auto_bg, auto_border, auto_text_col)
-
-    draw_pieces(screen, selected_idx)
-
-    # Solving overlay
-    if solving:
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 120))
-        font = create_scaled_font(FONT_SCALE_SOLVING, bold=True)
-        text_surf = font.render("Solving...", True, (255, 255, 80))
-        rect = text_surf.get_rect(
-            center=(screen.get_width() // 2, screen.get_height() // 2)
+        autosolve_button_y = button_y + button_h + int(CELL * 0.3)
+        autosolve_button_rect = pygame.Rect(
+            button_x, autosolve_button_y, button_w, button_h
         )
-        overlay.blit(text_surf, rect)
-        screen.blit(overlay, (0, 0))
-
-    # Apply first solver result once ready (no winner screen)
-    if not solving and solver_solutions and not auto_solve_active:
-        apply_solution(solver_solutions[solver_index])
-        auto_solve_active = True
-        timer_started = False
-        timer_start_time = None
-        timer_end_time = None
-
-    # Win / timer
-    if not win_mode:
-        if not auto_solve_active and is_only_today_visible():
-            if win_delay_frames == 0:
-                win_delay_frames = WIN_DELAY
-        else:
-            win_delay_frames = 0 if auto_solve_active else win_delay_frames
-        if win_delay_frames > 0:
-            win_delay_frames -= 1
-            if win_delay_frames == 0 and not auto_solve_active:
-                win_mode = True
-                spawn_confetti(screen)
-                if timer_started and timer_end_time is None:
-                    timer_end_time = time.time()
-
-    if win_mode:
-        draw_win_screen(screen)
-    else:
-        # Display timer
-        if timer_started:
-            elapsed = calculate_elapsed_time(timer_start_time, timer_end_time)
-        else:
-            elapsed = 0.0
-        timer_msg = format_timer(elapsed)
-        font_timer = create_scaled_font(FONT_SCALE_TIMER)
-        timer_surf = font_timer.render(timer_msg, True, (255, 255, 200))
-        pad = int(CELL * 0.3)
-        timer_rect = timer_surf.get_rect(topright=(screen.get_width() - pad, pad))
-        screen.blit(timer_surf, timer_rect)
-
-        # Display solution index when auto-solving
-        if auto_solve_active and solver_solutions:
-            idx_font = create_scaled_font(FONT_SCALE_SOLUTION_INDEX, bold=True)
-            s = f"Solution {solver_index + 1}/{len(solver_solutions)}  (← / →)"
-            idx_surf = idx_font.render(s, True, (255, 255, 255))
-            idx_rect = idx_surf.get_rect(
-                center=(
-                    GRID_W * CELL // 2,
-                    autosolve_button_y + button_h + int(CELL * 0.9),
-                )
+        auto_bg, auto_border, auto_text_col = get_button_theme_colors("autosolve")
+        draw_button(screen, autosolve_button_rect, "Auto-Solve", auto_bg, auto_border, auto_text_col)
+
+        draw_pieces(screen, selected_idx)
+
+        # Solving overlay
+        if solving:
+            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 120))
+            text_surf = render_text("Solving...", FONT_SCALE_SOLVING, (255, 255, 80), bold=True)
+            rect = text_surf.get_rect(
+                center=(screen.get_width() // 2, screen.get_height() // 2)
             )
-            screen.blit(idx_surf, idx_rect)
+            overlay.blit(text_surf, rect)
+            progress_surf = render_text(format_solver_progress(solver_progress), FONT_SCALE_CONTROLS, (255, 255, 200))  # noqa: E501
+            overlay.blit(progress_surf, progress_surf.get_rect(midtop=(rect.centerx, rect.bottom + 6)))  # noqa: E501
+            screen.blit(overlay, (0, 0))
 
-    pygame.display.flip()
-
-pygame.quit()
-sys.exit()
+        if win_mode:
+            draw_win_screen(screen)
+        else:
+            # Display timer
+            timer_surf = render_text(texts["timer"], FONT_SCALE_TIMER, (255, 255, 200))
+            pad = int(CELL * 0.3)
+            timer_rect = timer_surf.get_rect(topright=(screen.get_width() - pad, pad))
+            screen.blit(timer_surf, timer_rect)
+            hud_rects["timer"] = timer_rect
+
+            # Display solution index when auto-solving
+            if texts["index"] is not None:
+                idx_surf = render_text(texts["index"], FONT_SCALE_SOLUTION_INDEX, (255, 255, 255), bold=True)  # noqa: E501
+                idx_rect = idx_surf.get_rect(
+                    center=(
+                        GRID_W * CELL // 2,
+                        autosolve_button_y + button_h + int(CELL * 0.9),
+                    )
+                )
+                screen.blit(idx_surf, idx_rect)
+                hud_rects["index"] = idx_rect
+                line_y = idx_rect.bottom + 4
+                if texts["progress"] is not None:
+                    line_surf = render_text(texts["progress"], FONT_SCALE_CONTROLS, (255, 255, 200))
+                    line_rect = line_surf.get_rect(midtop=(GRID_W * CELL // 2, line_y))
+                    screen.blit(line_surf, line_rect)
+                    hud_rects["progress"] = line_rect
+                    line_y += line_surf.get_height() + 2
+                if texts["stats"] is not None:
+                    for line in texts["stats"]:
+                        line_surf = render_text(line, FONT_SCALE_CONTROLS, (255, 255, 200))
+                        line_rect = line_surf.get_rect(midtop=(GRID_W * CELL // 2, line_y))
+                        screen.blit(line_surf, line_rect)
+                        hud_rects["stats"] = line_rect.union(hud_rects.get("stats", line_rect))
+                        line_y += line_surf.get_height() + 2
+
+        pygame.display.update(dirty_rects(frame_state, snapshot, prev_hud_rects, hud_rects))
+        frame_state = snapshot
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1799 @@
+# Solver core of Caesar's Calendar Puzzle: board layout, pieces and the
+# exact-cover engines, with no pygame import. caldendar_puzzle.py is the
+# game front-end on top of it; batch tools and tests import this directly.
+# numpy, sqlite3 (solution_cache) and search_trace are imported where they
+# are used, so importing this module only takes a few milliseconds.
+import hashlib
+import time
+from array import array
+
+import solution_atlas
+
+# ------------------ BOARD SIZE ------------------
+GRID_W = 8
+GRID_H = 8
+
+# ------------------ PIECES ------------------
+PIECES_BASE = [
+    [(0, 0), (0, 1), (0, 2), (0, 3), (1, 3)],  # 1 Tall L
+    [(0, 0), (0, 1), (0, 2), (1, 2)],  # 2 Short L
+    [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1)],  # 3 U-shape
+    [(0, 0), (1, 0), (1, 1), (2, 1), (3, 1)],  # 4 long Z
+    [(0, 0), (1, 0), (1, 1), (2, 1)],  # 5 short Z
+    [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2)],  # 6 T
+    [(0, 0), (0, 1), (0, 2), (0, 3)],  # 7 line
+    [(0, 0), (1, 0), (0, 1), (1, 1), (2, 1)],  # 8 2x2+tab
+    [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0)],  # 9 Г
+    [(0, 0), (1, 0), (1, 1), (1, 2), (2, 2)],  # 10 custom S-like
+]
+
+
+# ------------------ BOARD LAYOUT ------------------
+MONTHS = [
+    "JAN",
+    "FEB",
+    "MAR",
+    "APR",
+    "MAY",
+    "JUN",
+    "JUL",
+    "AUG",
+    "SEP",
+    "OCT",
+    "NOV",
+    "DEC",
+]
+WEEKROW1 = ["SUN", "MON", "TUE", "WED"]
+WEEKROW2 = ["THU", "FRI", "SAT"]
+WEEKDAYS = WEEKROW1 + WEEKROW2
+
+board_mask = set()
+void_cells = set()
+cell_label = {}
+
+
+def build_layout() -> None:
+    board_mask.clear()
+    void_cells.clear()
+    cell_label.clear()
+    mi = 0
+    for ry in range(2):
+        for cx in range(1, 7):
+            pos = (cx, ry)
+            board_mask.add(pos)
+            cell_label[pos] = {"type": "month", "text": MONTHS[mi]}
+            mi += 1
+    void_cells.update({(7, 0), (7, 1)})
+
+    dx0, dy0 = 1, 2
+    day = 1
+    for ry in range(5):
+        for cx in range(7):
+            x, y = dx0 + cx, dy0 + ry
+            if day <= 31:
+                board_mask.add((x, y))
+                cell_label[(x, y)] = {"type": "date", "text": str(day)}
+                day += 1
+            else:
+                void_cells.add((x, y))
+
+    for i, wd in enumerate(WEEKROW1):
+        x, y = 4 + i, 6
+        board_mask.add((x, y))
+        cell_label[(x, y)] = {"type": "weekday", "text": wd}
+
+    for i, wd in enumerate(WEEKROW2):
+        x, y = 5 + i, 7
+        board_mask.add((x, y))
+        cell_label[(x, y)] = {"type": "weekday", "text": wd}
+
+    void_cells.update({(1, 7), (2, 7), (3, 7), (4, 7)})
+
+
+build_layout()
+
+
+def get_date_labels(day):
+    """Return the (month, date, weekday) cells for a datetime.date."""
+    month_str = day.strftime("%b").upper()
+    weekday_str = day.strftime("%a").upper()
+    month_cell = None
+    date_cell = None
+    weekday_cell = None
+    for pos, info in cell_label.items():
+        if info.get("type") == "month" and info.get("text") == month_str:
+            month_cell = pos
+        elif info.get("type") == "date" and info.get("text") == str(day.day):
+            date_cell = pos
+        elif info.get("type") == "weekday" and info.get("text") == weekday_str:
+            weekday_cell = pos
+    return month_cell, date_cell, weekday_cell
+
+
+# ------------------ PIECE ORIENTATION UTILS ------------------
+def rotate_shape(s):
+    return [(-y, x) for (x, y) in s]
+
+
+def flip_shape(s):
+    return [(-x, y) for (x, y) in s]
+
+
+def normalize(s):
+    minx = min(x for x, _ in s)
+    miny = min(y for _, y in s)
+    return [(x - minx, y - miny) for (x, y) in s]
+
+
+def oriented_cells(base_cells, rot, flip):
+    s = list(base_cells)
+    if flip:
+        s = flip_shape(s)
+    for _ in range(rot % 4):
+        s = rotate_shape(s)
+    return normalize(s)
+
+
+# The game front-end adds a "color" to each piece.
+pieces = [
+    {"name": f"P{i + 1}", "cells": normalize(base)}
+    for i, base in enumerate(PIECES_BASE)
+]
+
+
+# ------------------ DLX (Algorithm X) ------------------
+class DLXNode:
+    __slots__ = ("L", "R", "U", "D", "C", "row_id")
+
+    def __init__(self):
+        self.L = self.R = self.U = self.D = self
+        self.C = None
+        self.row_id = None
+
+
+class DLXColumn(DLXNode):
+    __slots__ = ("name", "size")
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.size = 0
+
+
+class CancelToken:
+    """Flag another thread can set to stop a running search."""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ProcessCancelToken:
+    """CancelToken backed by a multiprocessing Event, for searches in a child process."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self, context=None):
+        import multiprocessing
+
+        self._event = (context or multiprocessing).Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+
+class SearchStats:
+    """Counters an exact-cover search fills in once enable_stats() is called.
+
+    `branching[depth]` maps the number of candidate rows at a search node
+    to how many nodes at that depth had it; nodes with no candidates are
+    dead ends. `solution_times` holds seconds from the start of the search
+    to each solution. `covers`/`uncovers` stay 0 on the bitboard engine,
+    which has no cover step.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.start = time.perf_counter()
+        self.covers = 0
+        self.uncovers = 0
+        self.dead_ends = 0
+        self.branching = []
+        self.solution_times = []
+
+    def record_node(self, depth, candidates):
+        while len(self.branching) <= depth:
+            self.branching.append({})
+        level = self.branching[depth]
+        level[candidates] = level.get(candidates, 0) + 1
+        if not candidates:
+            self.dead_ends += 1
+
+    def record_solution(self):
+        self.solution_times.append(time.perf_counter() - self.start)
+
+    @property
+    def nodes(self):
+        """Search nodes visited: branch points plus solutions."""
+        return sum(sum(level.values()) for level in self.branching) + len(self.solution_times)
+
+    @property
+    def first_solution_time(self):
+        return self.solution_times[0] if self.solution_times else None
+
+    @property
+    def time_per_solution(self):
+        """Mean seconds between solutions after the first, or None."""
+        times = self.solution_times
+        if len(times) < 2:
+            return None
+        return (times[-1] - times[0]) / (len(times) - 1)
+
+    def mean_branching(self):
+        """Average candidate rows per node, one value per depth."""
+        return [
+            sum(k * n for k, n in level.items()) / sum(level.values())
+            for level in list(self.branching)
+        ]
+
+    def as_dict(self):
+        return {
+            "nodes": self.nodes,
+            "covers": self.covers,
+            "uncovers": self.uncovers,
+            "dead_ends": self.dead_ends,
+            "solutions": len(self.solution_times),
+            "first_solution_s": self.first_solution_time,
+            "time_per_solution_s": self.time_per_solution,
+            "branching": [dict(level) for level in self.branching],
+        }
+
+
+class SearchBudget:
+    """Time, node and cancellation limits shared by the exact-cover engines.
+
+    The searches bump `nodes` once per node and only call budget_exhausted()
+    when it reaches `next_check`, so the clock and the cancel token are read
+    every `check_every` nodes rather than on every node.
+    """
+
+    check_every = 1024
+    stats = None
+    progress = None
+
+    def enable_stats(self):
+        """Collect SearchStats during every later search; returns `stats`.
+
+        Off by default: the searches then only pay an `is None` test per
+        node. On the DLX engines cover()/uncover() are wrapped per instance
+        to count calls, so the class methods stay untouched. Calling it
+        again returns the same `stats` instead of wrapping them twice.
+        """
+        if self.stats is not None:
+            return self.stats
+        stats = self.stats = SearchStats()
+        if hasattr(self, "cover"):
+            cover, uncover = self.cover, self.uncover
+
+            def counted_cover(c):
+                stats.covers += 1
+                cover(c)
+
+            def counted_uncover(c):
+                stats.uncovers += 1
+                uncover(c)
+
+            self.cover = counted_cover
+            self.uncover = counted_uncover
+        return stats
+
+    def enable_progress(self, callback):
+        """Call callback(solver) at every budget check, i.e. every `check_every` nodes."""
+        self.progress = callback
+
+    def start_budget(self, time_limit=None, max_nodes=None, cancel=None):
+        if self.stats is not None:
+            self.stats.reset()
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.start_time = time.time()
+        self.nodes = 0
+        self.stopped = None
+        self.next_check = self.check_every if max_nodes is None else min(self.check_every, max_nodes)  # noqa: E501
+
+    def budget_exhausted(self):
+        """Check the limits; sets `stopped` to the reason once one is hit."""
+        if self.progress is not None:
+            self.progress(self)
+        if self.stopped is None:
+            if self.cancel is not None and self.cancel.cancelled:
+                self.stopped = "cancelled"
+            elif self.time_limit is not None and (time.time() - self.start_time) > self.time_limit:  # noqa: E501
+                self.stopped = "time"
+            elif self.max_nodes is not None and self.nodes >= self.max_nodes:
+                self.stopped = "nodes"
+        self.next_check = self.nodes + self.check_every
+        if self.max_nodes is not None:
+            self.next_check = min(self.next_check, self.max_nodes)
+        return self.stopped is not None
+
+
+class DLX(SearchBudget):
+    trace = None
+
+    def __init__(self):
+        self.header = DLXColumn("header")
+        self.columns = []
+        self.solution = []
+        self.solutions = []
+        self.max_solutions = None
+        self.row_nodes = {}
+        self.pruner = None
+        self.row_bits = {}
+        self.free = 0
+        self.used = 0
+        self.start_budget()
+
+    def enable_region_pruning(self, cells_mask, row_bits, pruner):
+        """Skip rows that would leave a dead region (see DeadRegionPruner).
+
+        `row_bits` maps row id -> (piece bit, cell mask) so the search can
+        track which cells are still open.
+        """
+        self.free = cells_mask
+        self.used = 0
+        self.row_bits = row_bits
+        self.pruner = pruner
+
+    def enable_trace(self, writer):
+        """Send solve_all()'s search tree to a search_trace.TraceWriter.
+
+        Columns are reported by their index in `columns`.
+        """
+        self.trace = writer
+        self.trace_columns = {c: i for i, c in enumerate(self.columns)}
+
+    def _leaves_dead_region(self, r):
+        piece_bit, mask = self.row_bits[r.row_id]
+        return self.pruner.dead(self.free & ~mask, self.used | piece_bit)
+
+    def _take_row(self, r):
+        if self.pruner is not None:
+            piece_bit, mask = self.row_bits[r.row_id]
+            self.free &= ~mask
+            self.used |= piece_bit
+
+    def _drop_row(self, r):
+        if self.pruner is not None:
+            piece_bit, mask = self.row_bits[r.row_id]
+            self.free |= mask
+            self.used &= ~piece_bit
+
+    def add_column(self, name):
+        c = DLXColumn(name)
+        c.R = self.header
+        c.L = self.header.L
+        self.header.L.R = c
+        self.header.L = c
+        self.columns.append(c)
+        return c
+
+    def add_row(self, row_id, col_objs):
+        first = None
+        for c in col_objs:
+            n = DLXNode()
+            n.C = c
+            n.row_id = row_id
+            n.U = c.U
+            n.D = c
+            c.U.D = n
+            c.U = n
+            c.size += 1
+            if first is None:
+                first = n
+                n.R = n.L = n
+                self.row_nodes[row_id] = n
+            else:
+                n.R = first
+                n.L = first.L
+                first.L.R = n
+                first.L = n
+
+    def cover(self, c):
+        c.R.L = c.L
+        c.L.R = c.R
+        i = c.D
+        while i != c:
+            j = i.R
+            while j != i:
+                j.D.U = j.U
+                j.U.D = j.D
+                j.C.size -= 1
+                j = j.R
+            i = i.D
+
+    def uncover(self, c):
+        i = c.U
+        while i != c:
+            j = i.L
+            while j != i:
+                j.C.size += 1
+                j.D.U = j
+                j.U.D = j
+                j = j.L
+            i = i.U
+        c.R.L = c
+        c.L.R = c
+
+    def choose_column(self):
+        c = self.header.R
+        best = c
+        while c != self.header:
+            if c.size < best.size:
+                best = c
+            c = c.R
+        return best
+
+    def search(self):
+        self.nodes += 1
+        if self.nodes >= self.next_check and self.budget_exhausted():
+            return None
+        if self.header.R == self.header:
+            if self.stats is not None:
+                self.stats.record_solution()
+            return list(self.solution)
+        c = self.choose_column()
+        if self.stats is not None:
+            self.stats.record_node(len(self.solution), c.size)
+        if c.size == 0:
+            return None
+        self.cover(c)
+        r = c.D
+        while r != c:
+            if self.pruner is not None and self._leaves_dead_region(r):
+                r = r.D
+                continue
+            self.solution.append(r)
+            self._take_row(r)
+            j = r.R
+            while j != r:
+                self.cover(j.C)
+                j = j.R
+            out = self.search()
+            if out is not None:
+                return out
+            j = r.L
+            while j != r:
+                self.uncover(j.C)
+                j = j.L
+            self._drop_row(r)
+            self.solution.pop()
+            r = r.D
+            if self.stopped:
+                return None
+        self.uncover(c)
+        return None
+
+    def solve(self, time_limit=None, max_nodes=None, cancel=None):
+        self.start_budget(time_limit, max_nodes, cancel)
+        return self.search()
+
+    def _search_all(self):
+        self.nodes += 1
+        if self.nodes >= self.next_check and self.budget_exhausted():
+            return
+        if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:
+            return
+        if self.header.R == self.header:
+            if self.stats is not None:
+                self.stats.record_solution()
+            if self.trace is not None:
+                self.trace.solution()
+            self.solutions.append(list(self.solution))
+            return
+        c = self.choose_column()
+        if self.stats is not None:
+            self.stats.record_node(len(self.solution), c.size)
+        if self.trace is not None:
+            self.trace.choose(self.trace_columns[c])
+        if c.size == 0:
+            return
+        self.cover(c)
+        r = c.D
+        while r != c:
+            if self.stopped:
+                break
+            if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:  # noqa: E501
+                break
+            if self.pruner is not None and self._leaves_dead_region(r):
+                r = r.D
+                continue
+            if self.trace is not None:
+                self.trace.try_row(r.row_id)
+            self.solution.append(r)
+            self._take_row(r)
+            j = r.R
+            while j != r:
+                self.cover(j.C)
+                j = j.R
+            self._search_all()
+            j = r.L
+            while j != r:
+                self.uncover(j.C)
+                j = j.L
+            self._drop_row(r)
+            self.solution.pop()
+            if self.trace is not None:
+                self.trace.undo()
+            r = r.D
+        self.uncover(c)
+
+    def solve_all(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        self.start_budget(time_limit, max_nodes, cancel)
+        self.max_solutions = max_solutions
+        self.solutions = []
+        self.solution = []
+        self._search_all()
+        return self.solutions
+
+    def iter_solutions(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        """Yield each solution (a list of row nodes) as soon as it is found.
+
+        Same search as solve_all(), driven by an explicit stack instead of
+        recursion. The matrix is restored when the generator finishes or is
+        closed early.
+        """
+        self.start_budget(time_limit, max_nodes, cancel)
+        stats = self.stats
+        found = 0
+        if self.header.R == self.header:
+            yield []
+            return
+        c = self.choose_column()
+        if stats is not None:
+            stats.record_node(0, c.size)
+        if c.size == 0:
+            return
+        self.cover(c)
+        stack = [c]
+        solution = []
+        r = c.D
+        try:
+            while stack:
+                c = stack[-1]
+                if r == c:
+                    # Column exhausted: backtrack to the previous level's next row.
+                    self.uncover(stack.pop())
+                    if not stack:
+                        break
+                    r = solution.pop()
+                    self._uncover_row(r)
+                    r = r.D
+                    continue
+                self.nodes += 1
+                if self.nodes >= self.next_check and self.budget_exhausted():
+                    return
+                if self.pruner is not None and self._leaves_dead_region(r):
+                    r = r.D
+                    continue
+                solution.append(r)
+                self._cover_row(r)
+                if self.header.R == self.header:
+                    if stats is not None:
+                        stats.record_solution()
+                    yield list(solution)
+                    found += 1
+                    if max_solutions is not None and found >= max_solutions:
+                        return
+                    self._uncover_row(solution.pop())
+                    r = r.D
+                    continue
+                nxt = self.choose_column()
+                if stats is not None:
+                    stats.record_node(len(stack), nxt.size)
+                if nxt.size == 0:
+                    self._uncover_row(solution.pop())
+                    r = r.D
+                    continue
+                self.cover(nxt)
+                stack.append(nxt)
+                r = nxt.D
+        finally:
+            while stack:
+                if len(solution) == len(stack):
+                    self._uncover_row(solution.pop())
+                else:
+                    self.uncover(stack.pop())
+
+    def _cover_row(self, r):
+        """Cover every column of r's row except r.C (already covered)."""
+        self._take_row(r)
+        j = r.R
+        while j != r:
+            self.cover(j.C)
+            j = j.R
+
+    def _uncover_row(self, r):
+        j = r.L
+        while j != r:
+            self.uncover(j.C)
+            j = j.L
+        self._drop_row(r)
+
+    def branch_prefixes(self, depth):
+        """Row-id paths through the first `depth` levels of the search tree."""
+        prefixes = []
+        self.solution = []
+
+        def walk(level):
+            if level == depth or self.header.R == self.header:
+                prefixes.append([r.row_id for r in self.solution])
+                return
+            c = self.choose_column()
+            if c.size == 0:
+                return
+            self.cover(c)
+            r = c.D
+            while r != c:
+                self.solution.append(r)
+                j = r.R
+                while j != r:
+                    self.cover(j.C)
+                    j = j.R
+                walk(level + 1)
+                j = r.L
+                while j != r:
+                    self.uncover(j.C)
+                    j = j.L
+                self.solution.pop()
+                r = r.D
+            self.uncover(c)
+
+        walk(0)
+        return prefixes
+
+    def solve_subtree(self, prefix, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):  # noqa: E501
+        """Like solve_all(), but only below the rows listed in `prefix`."""
+        self.start_budget(time_limit, max_nodes, cancel)
+        self.max_solutions = max_solutions
+        self.solutions = []
+        self.solution = []
+        for row_id in prefix:
+            r = self.row_nodes[row_id]
+            self.solution.append(r)
+            self._take_row(r)
+            self.cover(r.C)
+            j = r.R
+            while j != r:
+                self.cover(j.C)
+                j = j.R
+        self._search_all()
+        for r in reversed(self.solution):
+            j = r.L
+            while j != r:
+                self.uncover(j.C)
+                j = j.L
+            self.uncover(r.C)
+            self._drop_row(r)
+        self.solution = []
+        return self.solutions
+
+
+class ArrayDLX(SearchBudget):
+    """Dancing Links over flat int arrays instead of one object per node.
+
+    Node 0 is the header, every column and every 1 in the matrix is one more
+    node id; L/R/U/D hold neighbour ids, C the column node and S the column
+    size. Same interface as DLX, but solutions are lists of row ids.
+
+    The buffers are array('i') at rest. Each read of an array item boxes a
+    new int, so a search swaps them for lists (_unpack) and back (_pack).
+    """
+
+    def __init__(self):
+        self.L = array("i", [0])
+        self.R = array("i", [0])
+        self.U = array("i", [0])
+        self.D = array("i", [0])
+        self.C = array("i", [0])
+        self.S = array("i", [0])
+        self.row_of = array("i", [-1])
+        self.columns = []
+        self.solution = []
+        self.solutions = []
+        self.max_solutions = None
+        self.row_nodes = {}
+        self.pruner = None
+        self.row_bits = {}
+        self.free = 0
+        self.used = 0
+        self.start_budget()
+
+    def add_column(self, name):
+        L, R = self.L, self.R
+        c = len(L)
+        L.append(L[0])
+        R.append(0)
+        self.U.append(c)
+        self.D.append(c)
+        self.C.append(c)
+        self.S.append(0)
+        self.row_of.append(-1)
+        R[L[0]] = c
+        L[0] = c
+        self.columns.append(c)
+        return c
+
+    def add_row(self, row_id, col_ids):
+        L, R, U, D, S = self.L, self.R, self.U, self.D, self.S
+        first = n = len(L)
+        self.row_nodes[row_id] = first
+        for c in col_ids:
+            # Append below the column's last node; the row is linked in order.
+            L.append(n - 1 if n > first else first)
+            R.append(first)
+            U.append(U[c])
+            D.append(c)
+            D[U[c]] = n
+            U[c] = n
+            S[c] += 1
+            S.append(0)
+            n += 1
+        R[n - 1] = first
+        L[first] = n - 1
+        for k in range(first, n - 1):
+            R[k] = k + 1
+        self.C.extend(col_ids)
+        self.row_of.extend([row_id] * (n - first))
+
+    def _unpack(self):
+        self.L, self.R, self.U, self.D, self.C, self.S = (
+            buf.tolist() for buf in (self.L, self.R, self.U, self.D, self.C, self.S)
+        )
+
+    def _pack(self):
+        self.L, self.R, self.U, self.D, self.C, self.S = (
+            array("i", buf) for buf in (self.L, self.R, self.U, self.D, self.C, self.S)
+        )
+
+    def enable_region_pruning(self, cells_mask, row_bits, pruner):
+        """Skip rows that would leave a dead region (see DeadRegionPruner)."""
+        self.free = cells_mask
+        self.used = 0
+        self.row_bits = row_bits
+        self.pruner = pruner
+
+    def _leaves_dead_region(self, r):
+        piece_bit, mask = self.row_bits[self.row_of[r]]
+        return self.pruner.dead(self.free & ~mask, self.used | piece_bit)
+
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _cover_row(self, r):
+        """Cover every column of r's row except C[r] (already covered)."""
+        if self.pruner is not None:
+            piece_bit, mask = self.row_bits[self.row_of[r]]
+            self.free &= ~mask
+            self.used |= piece_bit
+        R, C = self.R, self.C
+        j = R[r]
+        while j != r:
+            self.cover(C[j])
+            j = R[j]
+
+    def _uncover_row(self, r):
+        L, C = self.L, self.C
+        j = L[r]
+        while j != r:
+            self.uncover(C[j])
+            j = L[j]
+        if self.pruner is not None:
+            piece_bit, mask = self.row_bits[self.row_of[r]]
+            self.free |= mask
+            self.used &= ~piece_bit
+
+    def choose_column(self):
+        R, S = self.R, self.S
+        c = R[0]
+        best = c
+        while c != 0:
+            if S[c] < S[best]:
+                best = c
+            c = R[c]
+        return best
+
+    def solve(self, time_limit=None, max_nodes=None, cancel=None):
+        sols = self.solve_all(time_limit, 1, max_nodes, cancel)
+        return sols[0] if sols else None
+
+    def _search_all(self):
+        self.nodes += 1
+        if self.nodes >= self.next_check and self.budget_exhausted():
+            return
+        if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:
+            return
+        if self.R[0] == 0:
+            if self.stats is not None:
+                self.stats.record_solution()
+            self.solutions.append([self.row_of[r] for r in self.solution])
+            return
+        c = self.choose_column()
+        if self.stats is not None:
+            self.stats.record_node(len(self.solution), self.S[c])
+        if self.S[c] == 0:
+            return
+        D = self.D
+        self.cover(c)
+        r = D[c]
+        while r != c:
+            if self.stopped:
+                break
+            if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:  # noqa: E501
+                break
+            if self.pruner is not None and self._leaves_dead_region(r):
+                r = D[r]
+                continue
+            self.solution.append(r)
+            self._cover_row(r)
+            self._search_all()
+            self._uncover_row(r)
+            self.solution.pop()
+            r = D[r]
+        self.uncover(c)
+
+    def solve_all(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        return self.solve_subtree([], time_limit, max_solutions, max_nodes, cancel)
+
+    def iter_solutions(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        """Yield each solution (a list of row ids) as soon as it is found.
+
+        Same stack-driven search as DLX.iter_solutions(); the matrix is
+        restored when the generator finishes or is closed early.
+        """
+        self.start_budget(time_limit, max_nodes, cancel)
+        if self.R[0] == 0:
+            yield []
+            return
+        self._unpack()
+        R, D, S, row_of = self.R, self.D, self.S, self.row_of
+        stats = self.stats
+        found = 0
+        stack = []
+        solution = []
+        try:
+            c = self.choose_column()
+            if stats is not None:
+                stats.record_node(0, S[c])
+            if S[c] == 0:
+                return
+            self.cover(c)
+            stack.append(c)
+            r = D[c]
+            while stack:
+                c = stack[-1]
+                if r == c:
+                    # Column exhausted: backtrack to the previous level's next row.
+                    self.uncover(stack.pop())
+                    if not stack:
+                        break
+                    r = solution.pop()
+                    self._uncover_row(r)
+                    r = D[r]
+                    continue
+                self.nodes += 1
+                if self.nodes >= self.next_check and self.budget_exhausted():
+                    return
+                if self.pruner is not None and self._leaves_dead_region(r):
+                    r = D[r]
+                    continue
+                solution.append(r)
+                self._cover_row(r)
+                if R[0] == 0:
+                    if stats is not None:
+                        stats.record_solution()
+                    yield [row_of[n] for n in solution]
+                    found += 1
+                    if max_solutions is not None and found >= max_solutions:
+                        return
+                    self._uncover_row(solution.pop())
+                    r = D[r]
+                    continue
+                nxt = self.choose_column()
+                if stats is not None:
+                    stats.record_node(len(stack), S[nxt])
+                if S[nxt] == 0:
+                    self._uncover_row(solution.pop())
+                    r = D[r]
+                    continue
+                self.cover(nxt)
+                stack.append(nxt)
+                r = D[nxt]
+        finally:
+            while stack:
+                if len(solution) == len(stack):
+                    self._uncover_row(solution.pop())
+                else:
+                    self.uncover(stack.pop())
+            self._pack()
+
+    def branch_prefixes(self, depth):
+        """Row-id paths through the first `depth` levels of the search tree."""
+        prefixes = []
+        path = []
+        self._unpack()
+        D, S, row_of = self.D, self.S, self.row_of
+
+        def walk(level):
+            if level == depth or self.R[0] == 0:
+                prefixes.append(list(path))
+                return
+            c = self.choose_column()
+            if S[c] == 0:
+                return
+            self.cover(c)
+            r = D[c]
+            while r != c:
+                path.append(row_of[r])
+                self._cover_row(r)
+                walk(level + 1)
+                self._uncover_row(r)
+                path.pop()
+                r = D[r]
+            self.uncover(c)
+
+        walk(0)
+        self._pack()
+        return prefixes
+
+    def solve_subtree(self, prefix, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):  # noqa: E501
+        """Like solve_all(), but only below the rows listed in `prefix`."""
+        self.start_budget(time_limit, max_nodes, cancel)
+        self.max_solutions = max_solutions
+        self.solutions = []
+        self.solution = []
+        self._unpack()
+        for row_id in prefix:
+            r = self.row_nodes[row_id]
+            self.solution.append(r)
+            self.cover(self.C[r])
+            self._cover_row(r)
+        self._search_all()
+        for r in reversed(self.solution):
+            self._uncover_row(r)
+            self.uncover(self.C[r])
+        self._pack()
+        self.solution = []
+        return self.solutions
+
+
+# ------------------ Bitboard Exact Cover ------------------
+BOARD_BITS = GRID_W * GRID_H
+ALL_BITS = (1 << BOARD_BITS) - 1
+LEFT_COL_BITS = sum(1 << (y * GRID_W) for y in range(GRID_H))
+RIGHT_COL_BITS = LEFT_COL_BITS << (GRID_W - 1)
+
+
+def cell_bit(cell):
+    x, y = cell
+    return 1 << (y * GRID_W + x)
+
+
+def cells_to_mask(cells):
+    mask = 0
+    for c in cells:
+        mask |= cell_bit(c)
+    return mask
+
+
+def isolated_cells(free):
+    """Return the bits of `free` that have no free 4-neighbour."""
+    neighbours = (
+        ((free << 1) & ~LEFT_COL_BITS)
+        | ((free >> 1) & ~RIGHT_COL_BITS)
+        | (free << GRID_W)
+        | (free >> GRID_W)
+    )
+    return free & ~neighbours & ALL_BITS
+
+
+class DeadRegionPruner:
+    """Spots boards that can no longer be finished because of an open region.
+
+    Flood-fills each connected region of open cells and rejects the board if
+    a region's size is not a sum of the remaining pieces' sizes (with only
+    4- and 5-cell pieces, regions of 1, 2, 3, 6, 7 or 11 cells are dead).
+    `checks` and `pruned` count how often it ran and how many branches it cut.
+    """
+
+    def __init__(self, piece_sizes):
+        self.piece_sizes = list(piece_sizes)
+        self.fillable = {}
+        self.checks = 0
+        self.pruned = 0
+
+    def fillable_sizes(self, used):
+        """Bitmask with bit n set if the unused pieces can fill n cells."""
+        sums = self.fillable.get(used)
+        if sums is None:
+            sums = 1
+            for piece_bit, size in self.piece_sizes:
+                if not used & piece_bit:
+                    sums |= sums << size
+            self.fillable[used] = sums
+        return sums
+
+    def dead(self, free, used):
+        self.checks += 1
+        sums = self.fillable_sizes(used)
+        while free:
+            region = free & -free
+            while True:
+                grown = (
+                    region
+                    | ((region << 1) & ~LEFT_COL_BITS)
+                    | ((region >> 1) & ~RIGHT_COL_BITS)
+                    | (region << GRID_W)
+                    | (region >> GRID_W)
+                ) & free
+                if grown == region:
+                    break
+                region = grown
+            if not sums >> bin(region).count("1") & 1:
+                self.pruned += 1
+                return True
+            free &= ~region
+        return False
+
+
+TRANSPOSITION_TABLE_SIZE = 1 << 18
+# Flood-fill dead-region pruning; see DeadRegionPruner for when it pays off.
+PRUNE_DEAD_REGIONS = False
+
+
+class BitboardSolver(SearchBudget):
+    """Exact cover over the 8x8 board packed into one int.
+
+    Every row is a (piece bit, cell mask) pair. The search always fills the
+    lowest empty cell, so a row is only ever tried from the cell holding its
+    lowest set bit. Candidates per cell are memoized on the local occupancy
+    around that cell, and branches that leave a single walled-in cell are
+    dropped straight away. With a DeadRegionPruner attached, branches that
+    leave any unfillable region are dropped too.
+    """
+
+    def __init__(self, cells_mask, num_pieces):
+        self.cells_mask = cells_mask
+        self.all_pieces = (1 << num_pieces) - 1
+        self.anchored = [[] for _ in range(BOARD_BITS)]
+        self.reach = [0] * BOARD_BITS
+        self.rows = {}
+        self.fits_memo = None
+        self.pruner = None
+        self.solutions = []
+        self.max_solutions = None
+        self.start_budget()
+
+    def add_row(self, row_id, mask, piece_bit):
+        anchor = (mask & -mask).bit_length() - 1
+        self.anchored[anchor].append((piece_bit, mask, row_id))
+        self.reach[anchor] |= mask
+        self.rows[row_id] = (piece_bit, mask)
+        self.fits_memo = None
+
+    def solve(self, time_limit=None, max_nodes=None, cancel=None):
+        sols = self.solve_all(time_limit, 1, max_nodes, cancel)
+        return sols[0] if sols else None
+
+    def solve_all(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        return self.solve_subtree([], time_limit, max_solutions, max_nodes, cancel)
+
+    def branch_prefixes(self, depth):
+        """Row-id paths through the first `depth` levels of the search tree."""
+        prefixes = []
+
+        def walk(occupied, used, path):
+            free = self.cells_mask & ~occupied
+            if len(path) == depth or not free:
+                prefixes.append(list(path))
+                return
+            anchor = (free & -free).bit_length() - 1
+            for piece_bit, mask, row_id in self.anchored[anchor]:
+                if used & piece_bit or occupied & mask:
+                    continue
+                if isolated_cells(free & ~mask):
+                    continue
+                path.append(row_id)
+                walk(occupied | mask, used | piece_bit, path)
+                path.pop()
+
+        walk(0, 0, [])
+        return prefixes
+
+    def solve_subtree(self, prefix, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):  # noqa: E501
+        """Like solve_all(), but only below the rows listed in `prefix`."""
+        self.start_budget(time_limit, max_nodes, cancel)
+        self.max_solutions = max_solutions
+        self.solutions = []
+        occupied = used = 0
+        for row_id in prefix:
+            piece_bit, mask = self.rows[row_id]
+            occupied |= mask
+            used |= piece_bit
+        if not self.cells_mask & ~occupied:
+            if used == self.all_pieces:
+                self.solutions.append(list(prefix))
+            return self.solutions
+        if self.fits_memo is None:
+            self.fits_memo = [{} for _ in range(BOARD_BITS)]
+        self._search_all(occupied, used, list(prefix))
+        return self.solutions
+
+    def _fits(self, occupied, free):
+        """Rows anchored at the lowest free cell that don't overlap `occupied`."""
+        anchor = (free & -free).bit_length() - 1
+        memo = self.fits_memo[anchor]
+        key = occupied & self.reach[anchor]
+        fits = memo.get(key)
+        if fits is None:
+            fits = [row for row in self.anchored[anchor] if not occupied & row[1]]
+            memo[key] = fits
+        return fits
+
+    def _search_all(self, occupied, used, solution):
+        self.nodes += 1
+        if self.nodes >= self.next_check and self.budget_exhausted():
+            return False
+        full = self.cells_mask
+        free = full & ~occupied
+        # Inlined _fits(): this is the hot path.
+        anchor = (free & -free).bit_length() - 1
+        memo = self.fits_memo[anchor]
+        key = occupied & self.reach[anchor]
+        fits = memo.get(key)
+        if fits is None:
+            fits = memo[key] = [row for row in self.anchored[anchor] if not occupied & row[1]]
+        if self.stats is not None:
+            self.stats.record_node(len(solution), sum(1 for row in fits if not used & row[0]))
+        pruner = self.pruner
+        for piece_bit, mask, row_id in fits:
+            if used & piece_bit:
+                continue
+            now_occupied = occupied | mask
+            now_free = full & ~now_occupied
+            if not now_free:
+                if used | piece_bit == self.all_pieces:
+                    if self.stats is not None:
+                        self.stats.record_solution()
+                    solution.append(row_id)
+                    self.solutions.append(list(solution))
+                    solution.pop()
+                    if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:  # noqa: E501
+                        return False
+                continue
+            if isolated_cells(now_free):
+                continue
+            if pruner is not None and pruner.dead(now_free, used | piece_bit):
+                continue
+            solution.append(row_id)
+            more = self._search_all(now_occupied, used | piece_bit, solution)
+            solution.pop()
+            if not more:
+                return False
+        return True
+
+    def iter_solutions(self, time_limit=None, max_solutions=None, max_nodes=None, cancel=None):
+        """Yield each solution (a list of row ids) as soon as it is found.
+
+        Same search as solve_all(), driven by an explicit stack so the caller
+        can act on the first solution while the rest are still being found.
+        """
+        self.start_budget(time_limit, max_nodes, cancel)
+        full = self.cells_mask
+        if self.fits_memo is None:
+            self.fits_memo = [{} for _ in range(BOARD_BITS)]
+        if not full:
+            return
+        found = 0
+        pruner = self.pruner
+        stats = self.stats
+        solution = []
+        fits = self._fits(0, full)
+        if stats is not None:
+            stats.record_node(0, len(fits))
+        stack = [(0, 0, iter(fits))]
+        while stack:
+            self.nodes += 1
+            if self.nodes >= self.next_check and self.budget_exhausted():
+                return
+            occupied, used, rows = stack[-1]
+            for piece_bit, mask, row_id in rows:
+                if used & piece_bit:
+                    continue
+                now_occupied = occupied | mask
+                now_free = full & ~now_occupied
+                if not now_free:
+                    if used | piece_bit == self.all_pieces:
+                        if stats is not None:
+                            stats.record_solution()
+                        yield solution + [row_id]
+                        found += 1
+                        if max_solutions is not None and found >= max_solutions:
+                            return
+                    continue
+                if isolated_cells(now_free):
+                    continue
+                if pruner is not None and pruner.dead(now_free, used | piece_bit):
+                    continue
+                solution.append(row_id)
+                fits = self._fits(now_occupied, now_free)
+                if stats is not None:
+                    now_used = used | piece_bit
+                    stats.record_node(len(solution), sum(1 for row in fits if not now_used & row[0]))  # noqa: E501
+                stack.append((now_occupied, used | piece_bit, iter(fits)))
+                break
+            else:
+                stack.pop()
+                if solution:
+                    solution.pop()
+
+
+    def count_all(self, time_limit=None, max_nodes=None, cancel=None,
+                  table_size=TRANSPOSITION_TABLE_SIZE):
+        """Count solutions without building any of them.
+
+        Sub-boards are memoized on (occupied cells, used pieces) in a
+        fixed-size transposition table: one entry per slot, newest wins, so
+        memory stays bounded however big the search gets. When one piece is
+        left, the remaining cells are simply looked up among its placements.
+        If a budget stops the search, `stopped` is set and the count is only
+        a lower bound.
+        """
+        self.start_budget(time_limit, max_nodes, cancel)
+        if self.fits_memo is None:
+            self.fits_memo = [{} for _ in range(BOARD_BITS)]
+        full = self.cells_mask
+        all_pieces = self.all_pieces
+        fits_memo = self.fits_memo
+        reach = self.reach
+        anchored = self.anchored
+        pruner = self.pruner
+        last_piece = {}
+        for piece_bit, mask in self.rows.values():
+            last_piece.setdefault(piece_bit, set()).add(mask)
+        table_keys = self.table_keys = [None] * table_size
+        table_counts = self.table_counts = [0] * table_size
+        self.table_hits = 0
+
+        def count(occupied, used):
+            self.nodes += 1
+            if self.nodes >= self.next_check and self.budget_exhausted():
+                return 0
+            free = full & ~occupied
+            left = all_pieces & ~used
+            if not left & (left - 1):
+                return 1 if free in last_piece.get(left, ()) else 0
+            key = occupied | (used << BOARD_BITS)
+            slot = hash(key) % table_size
+            if table_keys[slot] == key:
+                self.table_hits += 1
+                return table_counts[slot]
+            anchor = (free & -free).bit_length() - 1
+            memo = fits_memo[anchor]
+            local = occupied & reach[anchor]
+            fits = memo.get(local)
+            if fits is None:
+                fits = memo[local] = [row for row in anchored[anchor] if not occupied & row[1]]
+            total = 0
+            for piece_bit, mask, row_id in fits:
+                if used & piece_bit:
+                    continue
+                now_free = free & ~mask
+                if isolated_cells(now_free):
+                    continue
+                if pruner is not None and pruner.dead(now_free, used | piece_bit):
+                    continue
+                total += count(occupied | mask, used | piece_bit)
+            if self.stopped is None:
+                table_keys[slot] = key
+                table_counts[slot] = total
+            return total
+
+        if not full:
+            return 0
+        return count(0, 0)
+
+
+# ------------------ Solver: Build Exact Cover ------------------
+def all_piece_orientations(base_cells):
+    seen = set()
+    for flip in [False, True]:
+        for rot in range(4):
+            oc = tuple(sorted(normalize(oriented_cells(base_cells, rot, flip))))
+            if oc not in seen:
+                seen.add(oc)
+                yield (rot, flip, [c for c in oc])
+
+
+def generate_placements(forbidden):
+    import numpy as np
+    # open_cells[y, x] is True where a piece may go; each orientation is
+    # checked at every offset at once by indexing its cells into a sliding
+    # window over that array.
+    open_cells = np.zeros((GRID_H, GRID_W), dtype=bool)
+    for x, y in board_mask:
+        open_cells[y, x] = True
+    for x, y in forbidden:
+        if 0 <= x < GRID_W and 0 <= y < GRID_H:
+            open_cells[y, x] = False
+
+    n = len(pieces)
+    per_piece = []
+    for pid in range(n):
+        base = pieces[pid]["cells"]
+        piece_list = []
+        ori_list = list(all_piece_orientations(base))
+        for rot, flip, shape in ori_list:
+            xs = np.array([x for x, y in shape])
+            ys = np.array([y for x, y in shape])
+            windows = np.lib.stride_tricks.sliding_window_view(
+                open_cells, (ys.max() + 1, xs.max() + 1)
+            )
+            fits = windows[:, :, ys, xs].all(axis=-1)
+            # Transposed so offsets come out x0-major, as they always have.
+            for x0, y0 in np.argwhere(fits.T).tolist():
+                abs_cells = tuple((x0 + x, y0 + y) for (x, y) in shape)
+                piece_list.append((pid, rot, flip, x0, y0, abs_cells))
+        per_piece.append(piece_list)
+    return per_piece
+
+
+# Compiled placement tables, keyed by layout_fingerprint().
+_compiled_placements = {}
+
+
+def compiled_placements():
+    """Every legal placement on the full board as (placement, cell mask) pairs.
+
+    Compiled once per board layout and piece set; a date's placements are
+    the ones whose mask misses its forbidden cells, in the same order
+    generate_placements(forbidden) would list them.
+    """
+    key = layout_fingerprint()
+    table = _compiled_placements.get(key)
+    if table is None:
+        table = [
+            (row, cells_to_mask(row[5]))
+            for plist in generate_placements(set())
+            for row in plist
+        ]
+        _compiled_placements[key] = table
+    return table
+
+
+def build_exact_cover(forbidden, engine="bitboard", prune_regions=PRUNE_DEAD_REGIONS):
+    """Build the exact-cover matrix for the board with `forbidden` left open.
+
+    Returns (solver, row_map); row ids index into row_map, and the same
+    forbidden set always yields the same row ids. With `prune_regions` the
+    solver gets a DeadRegionPruner as `solver.pruner` (otherwise None).
+    """
+    to_cover = sorted(set(board_mask) - set(forbidden))
+    forbidden_mask = cells_to_mask(forbidden)
+    compiled = [(row, mask) for row, mask in compiled_placements() if not mask & forbidden_mask]
+    row_map = [row for row, _ in compiled]
+
+    if engine in ("dlx", "dlx-array"):
+        solver = DLX() if engine == "dlx" else ArrayDLX()
+        cell_col = {}
+        for cell in to_cover:
+            cell_col[cell] = solver.add_column(("C", cell))
+        piece_col = {}
+        for pid in range(len(pieces)):
+            piece_col[pid] = solver.add_column(("P", pid))
+        for row_id, (pid, rot, flip, x0, y0, abs_cells) in enumerate(row_map):
+            solver.add_row(row_id, [piece_col[pid]] + [cell_col[c] for c in abs_cells])
+    elif engine == "bitboard":
+        solver = BitboardSolver(cells_to_mask(to_cover), len(pieces))
+        for row_id, (row, mask) in enumerate(compiled):
+            solver.add_row(row_id, mask, 1 << row[0])
+    else:
+        raise ValueError(f"Unknown solver engine: {engine!r}")
+
+    if prune_regions:
+        pruner = DeadRegionPruner((1 << pid, len(p["cells"])) for pid, p in enumerate(pieces))
+        if engine != "bitboard":
+            row_bits = {
+                row_id: (1 << row[0], mask) for row_id, (row, mask) in enumerate(compiled)
+            }
+            solver.enable_region_pruning(cells_to_mask(to_cover), row_bits, pruner)
+        else:
+            solver.pruner = pruner
+    return solver, row_map
+
+
+def solution_row_ids(sol):
+    """Row ids of a raw solver solution (DLX nodes or bitboard row ids)."""
+    return [r.row_id if isinstance(r, DLXNode) else r for r in sol]
+
+
+def solutions_from_rows(row_map, sols_rows):
+    results = []
+    for sol_rows in sols_rows:
+        chosen_rows = [row_map[row_id] for row_id in solution_row_ids(sol_rows)]
+        chosen_rows.sort(key=lambda t: t[0])
+        out = []
+        for (pid, rot, flip, x0, y0, abs_cells) in chosen_rows:
+            out.append((x0, y0, rot, flip, list(abs_cells)))
+        results.append(out)
+    return results
+
+
+def iter_solutions(forbidden, time_limit=10.0, max_solutions=None, engine="bitboard",
+                   max_nodes=None, cancel=None, prune_regions=PRUNE_DEAD_REGIONS):
+    """Yield solutions one at a time, in dlx_build_and_solve_all() format."""
+    solver, row_map = build_exact_cover(forbidden, engine, prune_regions)
+    for sol in solver.iter_solutions(time_limit, max_solutions, max_nodes, cancel):
+        yield solutions_from_rows(row_map, [sol])[0]
+
+
+def count_solutions(forbidden, time_limit=None, max_nodes=None, cancel=None,
+                    table_size=TRANSPOSITION_TABLE_SIZE, prune_regions=PRUNE_DEAD_REGIONS):
+    """Number of ways to tile the board leaving `forbidden` uncovered.
+
+    Uses BitboardSolver.count_all(), so no solution list is ever built.
+    """
+    solver, _ = build_exact_cover(forbidden, "bitboard", prune_regions)
+    return solver.count_all(time_limit, max_nodes, cancel, table_size)
+
+
+def dlx_build_and_solve_all(forbidden, time_limit=10.0, max_solutions=200, engine="bitboard",
+                            max_nodes=None, cancel=None, prune_regions=PRUNE_DEAD_REGIONS,
+                            collect_stats=False):
+    """Enumerate tilings of the board leaving `forbidden` uncovered.
+
+    `engine` picks the exact-cover backend: "bitboard" (default), the
+    linked-node "dlx" or the array-backed "dlx-array". All return the same
+    per-piece placement lists.
+    `max_nodes` and `cancel` (a CancelToken) stop the search early.
+    `prune_regions` turns on dead-region pruning (see DeadRegionPruner).
+    With `collect_stats` the result is (solutions, SearchStats).
+    """
+    solver, row_map = build_exact_cover(forbidden, engine, prune_regions)
+    stats = solver.enable_stats() if collect_stats else None
+    sols = solutions_from_rows(row_map, solver.solve_all(time_limit, max_solutions, max_nodes, cancel))  # noqa: E501
+    if collect_stats:
+        return sols, stats
+    return sols
+
+
+def trace_search(forbidden, path, time_limit=None, max_solutions=None, title=""):
+    """Run the DLX search for `forbidden`, writing its tree to a trace file.
+
+    Returns the number of events written; see search_trace.py for the
+    format and the summary tools.
+    """
+    import search_trace
+
+    solver, row_map = build_exact_cover(forbidden, "dlx")
+    columns = []
+    for c in solver.columns:
+        kind, what = c.name
+        if kind == "P":
+            columns.append(f"piece {what}")
+        else:
+            info = cell_label.get(what)
+            columns.append(f"cell {info['text'] if info else what}")
+    row_pieces = [f"piece {row[0]}" for row in row_map]
+    with search_trace.TraceWriter(path, columns, row_pieces, title) as writer:
+        solver.enable_trace(writer)
+        solver.solve_all(time_limit, max_solutions)
+    return writer.events
+
+
+# ------------------ Solution Atlas ------------------
+_placement_source = None
+_placement_table = None
+_placement_lookup = None
+_atlas = None
+
+
+def all_placements():
+    """Every legal placement on the full board, in a stable order."""
+    global _placement_source, _placement_table, _placement_lookup
+    compiled = compiled_placements()
+    if _placement_source is not compiled:
+        _placement_source = compiled
+        _placement_table = [row for row, _ in compiled]
+        _placement_lookup = {
+            (pid, x0, y0, rot, flip): i
+            for i, (pid, rot, flip, x0, y0, _) in enumerate(_placement_table)
+        }
+    return _placement_table
+
+
+def layout_fingerprint():
+    """16-byte digest of the board layout and piece set."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((GRID_W, GRID_H, sorted(board_mask), [p["cells"] for p in pieces])).encode())
+    return h.digest()
+
+
+def atlas_key_for_cells(cells):
+    """Atlas slot for a month/date/weekday cell triple, or None."""
+    labels = {}
+    for pos in cells:
+        info = cell_label.get(pos)
+        if info is None:
+            return None
+        labels[info["type"]] = info["text"]
+    if len(labels) != 3 or set(labels) != {"month", "date", "weekday"}:
+        return None
+    return solution_atlas.atlas_key(
+        MONTHS.index(labels["month"]), int(labels["date"]), WEEKDAYS.index(labels["weekday"])
+    )
+
+
+def solution_from_indices(indices):
+    table = all_placements()
+    out = []
+    for idx in indices:
+        pid, rot, flip, x0, y0, abs_cells = table[idx]
+        out.append((x0, y0, rot, flip, list(abs_cells)))
+    return out
+
+
+def solution_to_indices(sol):
+    all_placements()
+    return [_placement_lookup[(pid, x0, y0, rot, flip)] for pid, (x0, y0, rot, flip, _) in enumerate(sol)]  # noqa: E501
+
+
+def get_atlas(path=None):
+    """Open the atlas once; returns None if it is missing or stale."""
+    global _atlas
+    if _atlas is None:
+        _atlas = False
+        try:
+            atlas = solution_atlas.SolutionAtlas(path or solution_atlas.DEFAULT_ATLAS_PATH)
+        except (OSError, ValueError):
+            return None
+        if atlas.fingerprint != layout_fingerprint() or atlas.num_placements != len(all_placements()):  # noqa: E501
+            atlas.close()
+            return None
+        _atlas = atlas
+    return _atlas or None
+
+
+def lookup_atlas_solutions(forbidden, max_solutions=None):
+    """Precomputed solutions for `forbidden`, or None unless the atlas has enough."""
+    atlas = get_atlas()
+    key = atlas_key_for_cells(forbidden)
+    if atlas is None or key is None:
+        return None
+    if not atlas.complete(key) and (max_solutions is None or atlas.count(key) < max_solutions):
+        return None
+    sols = atlas.solutions(key)
+    if max_solutions is not None:
+        sols = sols[:max_solutions]
+    return [solution_from_indices(s) for s in sols]
+
+
+def build_solution_atlas(path, max_solutions=500, time_limit=None, progress=None):
+    """Solve every label triple and write the results to `path`."""
+    label_cells = {}
+    for pos, info in cell_label.items():
+        label_cells[(info["type"], info["text"])] = pos
+
+    def solve_all_keys():
+        for mi, month in enumerate(MONTHS):
+            for day in range(1, solution_atlas.NUM_DAYS + 1):
+                for wi, weekday in enumerate(WEEKDAYS):
+                    forbidden = {
+                        label_cells[("month", month)],
+                        label_cells[("date", str(day))],
+                        label_cells[("weekday", weekday)],
+                    }
+                    solver, row_map = build_exact_cover(forbidden)
+                    sols = solutions_from_rows(row_map, solver.solve_all(time_limit, max_solutions))
+                    complete = solver.stopped is None and (max_solutions is None or len(sols) < max_solutions)  # noqa: E501
+                    if progress is not None:
+                        progress(month, day, weekday, len(sols))
+                    yield complete, [solution_to_indices(sol) for sol in sols]
+
+    solution_atlas.write_atlas(
+        path, layout_fingerprint(), len(pieces), len(all_placements()), solve_all_keys()
+    )
+
+
+# ------------------ Solution Cache ------------------
+_solution_cache = None
+
+
+def get_solution_cache():
+    """Open the solution cache once; memory-only if the file can't be opened."""
+    import sqlite3
+
+    import solution_cache
+
+    global _solution_cache
+    if _solution_cache is None:
+        try:
+            _solution_cache = solution_cache.SolutionCache()
+        except (OSError, sqlite3.Error):
+            _solution_cache = solution_cache.SolutionCache(path=None)
+    return _solution_cache
+
+
+def solution_cache_key(forbidden):
+    import solution_cache
+
+    return solution_cache.cache_key(layout_fingerprint(), forbidden)
+
+
+def lookup_cached_solutions(forbidden, max_solutions=None, cache=None):
+    """Cached solutions for `forbidden`, or None unless the cache has enough."""
+    cache = cache or get_solution_cache()
+    entry = cache.get(solution_cache_key(forbidden))
+    if entry is None:
+        return None
+    complete, sols = entry
+    if not complete and (max_solutions is None or len(sols) < max_solutions):
+        return None
+    if max_solutions is not None:
+        sols = sols[:max_solutions]
+    return [solution_from_indices(s) for s in sols]
+
+
+def store_cached_solutions(forbidden, sols, complete, cache=None):
+    """Cache `sols`; `complete` says they are all of forbidden's solutions."""
+    cache = cache or get_solution_cache()
+    cache.put(solution_cache_key(forbidden), complete, [solution_to_indices(sol) for sol in sols],
+              len(pieces))
+
+
+def cached_solve_all(forbidden, time_limit=10.0, max_solutions=200, engine="bitboard", cache=None):  # noqa: E501
+    """dlx_build_and_solve_all() behind the solution cache.
+
+    Searches cut short by the time limit are returned but not cached.
+    """
+    sols = lookup_cached_solutions(forbidden, max_solutions, cache)
+    if sols is not None:
+        return sols
+    solver, row_map = build_exact_cover(forbidden, engine)
+    sols = solutions_from_rows(row_map, solver.solve_all(time_limit, max_solutions))
+    if solver.stopped is None:
+        complete = max_solutions is None or len(sols) < max_solutions
+        store_cached_solutions(forbidden, sols, complete, cache)
+    return sols
+
+
+# ------------------ Background Solve ------------------
+# Messages solve_worker() puts on its queue.
+SOLUTIONS = "solutions"
+PROGRESS = "progress"
+DONE = "done"
+
+
+def encode_solutions(sols):
+    """Pack solutions as atlas placement indices, 2 bytes per piece."""
+    return array("H", [idx for sol in sols for idx in solution_to_indices(sol)]).tobytes()
+
+
+def decode_solutions(data):
+    flat = array("H")
+    flat.frombytes(data)
+    n = len(pieces)
+    return [solution_from_indices(flat[i:i + n]) for i in range(0, len(flat), n)]
+
+
+def estimate_remaining(found, elapsed, time_limit=None, max_solutions=None):
+    """Seconds until the search hits a limit at its current rate, or None.
+
+    A full enumeration with no limits has no estimate: the size of the
+    search tree is unknown until it has been walked.
+    """
+    remaining = []
+    if time_limit is not None:
+        remaining.append(max(0.0, time_limit - elapsed))
+    if max_solutions is not None and found:
+        remaining.append(elapsed / found * (max_solutions - found))
+    return min(remaining) if remaining else None
+
+
+def solve_worker(forbidden, out, cancel, time_limit=10.0, max_solutions=500, use_cache=True,
+                 flush_every=0.05, progress_every=0.1):
+    """Auto-Solve for a child process; results go to the queue `out`.
+
+    Puts (SOLUTIONS, encode_solutions() bytes) messages, the first solution
+    on its own and later ones batched at most every `flush_every` seconds,
+    and at most every `progress_every` seconds (PROGRESS, dict) with the
+    solutions found so far, nodes visited, elapsed seconds and
+    estimate_remaining(). Ends with (DONE, stopped, stats): `stopped` as
+    on the solver, `stats` the SearchStats, or None when the atlas or
+    cache had the answer. A cancelled search puts nothing more.
+    """
+    sols = None
+    if use_cache:
+        sols = lookup_atlas_solutions(forbidden, max_solutions)
+        if sols is None:
+            sols = lookup_cached_solutions(forbidden, max_solutions)
+    if sols is not None:
+        out.put((SOLUTIONS, encode_solutions(sols)))
+        out.put((DONE, None, None))
+        return
+    solver, row_map = build_exact_cover(forbidden)
+    stats = solver.enable_stats()
+    found = []
+    batch = []
+    start = last_flush = last_progress = time.perf_counter()
+
+    def report(solver):
+        nonlocal last_progress
+        now = time.perf_counter()
+        if now - last_progress >= progress_every and not cancel.cancelled:
+            last_progress = now
+            elapsed = now - start
+            out.put((PROGRESS, {
+                "solutions": len(found),
+                "nodes": solver.nodes,
+                "elapsed": elapsed,
+                "remaining": estimate_remaining(len(found), elapsed, time_limit, max_solutions),
+            }))
+
+    solver.enable_progress(report)
+    for rows in solver.iter_solutions(time_limit=time_limit, max_solutions=max_solutions, cancel=cancel):  # noqa: E501
+        if cancel.cancelled:
+            break
+        sol = solutions_from_rows(row_map, [rows])[0]
+        found.append(sol)
+        batch.append(sol)
+        now = time.perf_counter()
+        if len(found) == 1 or now - last_flush >= flush_every:
+            out.put((SOLUTIONS, encode_solutions(batch)))
+            batch = []
+            last_flush = now
+    if cancel.cancelled:
+        out.cancel_join_thread()  # nobody reads this queue any more; don't block on exit
+        return
+    if batch:
+        out.put((SOLUTIONS, encode_solutions(batch)))
+    if solver.stopped is None and use_cache:
+        complete = max_solutions is None or len(found) < max_solutions
+        store_cached_solutions(forbidden, found, complete)
+    out.put((DONE, solver.stopped, stats))
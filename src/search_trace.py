@@ -0,0 +1,254 @@
+# Search-tree traces of the DLX solver, for offline profiling.
+# A trace is a JSON header followed by a stream of 3-byte events; the
+# summary tools rebuild subtree sizes from it without re-running the search.
+import json
+import os
+import struct
+import sys
+from html import escape
+
+TRACE_MAGIC = b"CCTR"
+TRACE_VERSION = 1
+
+# magic, version, length of the JSON metadata that follows
+HEADER = struct.Struct("<4sHI")
+# event kind, column index or row id
+EVENT = struct.Struct("<BH")
+
+CHOOSE = 1    # a search node picked this column
+TRY = 2       # a row of that column was tried
+UNDO = 3      # the row's subtree is finished and the row taken back
+SOLUTION = 4  # every column is covered
+
+FLUSH_BYTES = 1 << 16
+
+
+class TraceWriter:
+    """Streams search events to `path`, buffered in FLUSH_BYTES chunks.
+
+    `columns` and `row_pieces` are display labels for column indices and
+    for the piece of each row id; they go into the header.
+    """
+
+    def __init__(self, path, columns, row_pieces, title=""):
+        meta = json.dumps({"title": title, "columns": list(columns), "row_pieces": list(row_pieces)})  # noqa: E501
+        meta = meta.encode()
+        self._f = open(path, "wb")
+        self._f.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(meta)))
+        self._f.write(meta)
+        self._buf = bytearray()
+        self.events = 0
+
+    def _event(self, kind, value):
+        self._buf += EVENT.pack(kind, value)
+        self.events += 1
+        if len(self._buf) >= FLUSH_BYTES:
+            self._f.write(self._buf)
+            self._buf.clear()
+
+    def choose(self, column):
+        self._event(CHOOSE, column)
+
+    def try_row(self, row_id):
+        self._event(TRY, row_id)
+
+    def undo(self):
+        self._event(UNDO, 0)
+
+    def solution(self):
+        self._event(SOLUTION, 0)
+
+    def close(self):
+        if self._f is not None:
+            self._f.write(self._buf)
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path):
+    """Return (metadata, iterator of (kind, value) events) for a trace file.
+
+    The header is checked right away; events are read FLUSH_BYTES at a time
+    as the iterator is consumed, so a full-enumeration trace never has to
+    fit in memory. The iterator can only be consumed once.
+    """
+    f = open(path, "rb")
+    try:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise ValueError(f"{path} is too small to be a search trace")
+        magic, version, meta_len = HEADER.unpack(head)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} search trace")
+        meta = json.loads(f.read(meta_len))
+    except BaseException:
+        f.close()
+        raise
+    return meta, _iter_events(f)
+
+
+def _iter_events(f):
+    with f:
+        tail = b""
+        while True:
+            chunk = f.read(FLUSH_BYTES)
+            if not chunk:
+                return  # a trailing partial event is dropped
+            data = tail + chunk
+            usable = len(data) - len(data) % EVENT.size
+            yield from EVENT.iter_unpack(data[:usable])
+            tail = data[usable:]
+
+
+def summarize(meta, events):
+    """Rebuild the search tree's shape from a trace, in one pass over `events`.
+
+    Returns a dict with node and solution totals, `stacks` (chosen-column
+    label path -> nodes, the input of a flame graph) and, per column and
+    per piece, the nodes spent below rows that led to no solution.
+    """
+    columns = meta["columns"]
+    row_pieces = meta["row_pieces"]
+    nodes = solutions = 0
+    path = []
+    tries = []
+    stacks = {}
+    column_waste = {}
+    piece_waste = {}
+    for kind, value in events:
+        if kind == CHOOSE:
+            nodes += 1
+            del path[len(tries):]
+            path.append(columns[value])
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0) + 1
+        elif kind == TRY:
+            tries.append((value, path[len(tries)], nodes, solutions))
+        elif kind == UNDO:
+            row_id, column, nodes_before, solutions_before = tries.pop()
+            if solutions == solutions_before:
+                size = nodes - nodes_before
+                column_waste[column] = column_waste.get(column, 0) + size
+                piece = row_pieces[row_id]
+                piece_waste[piece] = piece_waste.get(piece, 0) + size
+        elif kind == SOLUTION:
+            nodes += 1
+            solutions += 1
+    return {
+        "title": meta.get("title", ""),
+        "nodes": nodes,
+        "solutions": solutions,
+        "stacks": stacks,
+        "column_waste": column_waste,
+        "piece_waste": piece_waste,
+    }
+
+
+def format_report(summary, top=10):
+    """Plain-text report: totals and the worst backtracking columns and pieces."""
+    lines = [
+        f"{summary['title']}: {summary['nodes']:,} nodes, {summary['solutions']:,} solutions",
+    ]
+    for heading, waste in (("Columns", summary["column_waste"]), ("Pieces", summary["piece_waste"])):  # noqa: E501
+        lines.append(f"{heading} by nodes spent in dead subtrees:")
+        total = summary["nodes"] or 1
+        for label, size in sorted(waste.items(), key=lambda kv: -kv[1])[:top]:
+            lines.append(f"  {label:<12} {size:>10,}  {size / total:6.1%}")
+    return "\n".join(lines)
+
+
+def folded_stacks(summary):
+    """Lines in the folded format read by flamegraph.pl and speedscope."""
+    return [f"{key} {count}" for key, count in sorted(summary["stacks"].items())]
+
+
+def write_svg(summary, path, width=1200, row_height=16):
+    """Icicle graph of the search tree: root at the top, width = subtree nodes."""
+    tree = {}
+    for key, count in summary["stacks"].items():
+        node = tree
+        for label in key.split(";"):
+            node = node.setdefault(label, [0, {}])
+            node[0] += count
+            node = node[1]
+    total = sum(child[0] for child in tree.values()) or 1
+    rects = []
+    depth_max = 0
+
+    def draw(children, x, depth):
+        nonlocal depth_max
+        depth_max = max(depth_max, depth)
+        for label, (count, grandchildren) in sorted(children.items()):
+            w = count * width / total
+            if w >= 0.5:
+                hue = sum(map(ord, label)) % 60
+                rects.append(
+                    f'<g><title>{escape(label)}: {count:,} nodes</title>'
+                    f'<rect x="{x:.1f}" y="{depth * row_height}" width="{w:.1f}" '
+                    f'height="{row_height - 1}" fill="hsl({hue},80%,60%)"/>'
+                    + (f'<text x="{x + 2:.1f}" y="{depth * row_height + row_height - 4}">'
+                       f'{escape(label)}</text>' if w > 7 * len(label) else "")
+                    + "</g>"
+                )
+                draw(grandchildren, x, depth + 1)
+            x += w
+
+    draw(tree, 0.0, 0)
+    height = (depth_max + 1) * row_height
+    with open(path, "w") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'font-family="monospace" font-size="11">\n')
+        f.write("\n".join(rects))
+        f.write("\n</svg>\n")
+
+
+def main(argv=None):
+    import argparse
+    import datetime
+
+    parser = argparse.ArgumentParser(description="Record or summarize DLX search-tree traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="trace the DLX search for one date")
+    record.add_argument("--date", type=datetime.date.fromisoformat, default=datetime.date.today(),  # noqa: E501
+                        help="date to solve (YYYY-MM-DD)")
+    record.add_argument("--output", required=True, help="trace file to write")
+    record.add_argument("--max-solutions", type=int, default=0, help="stop after this many (0 = all)")  # noqa: E501
+    record.add_argument("--time-limit", type=float, default=None, help="seconds")
+    report = sub.add_parser("summary", help="report on a recorded trace")
+    report.add_argument("trace", help="trace file to read")
+    report.add_argument("--top", type=int, default=10, help="columns and pieces to list")
+    report.add_argument("--folded", default=None, help="write folded stacks to this file")
+    report.add_argument("--svg", default=None, help="write an icicle graph to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        import puzzle_core as core
+
+        forbidden = set(core.get_date_labels(args.date))
+        if None in forbidden:
+            print(f"{args.date} has no cells on this board")
+            return 1
+        events = core.trace_search(forbidden, args.output, time_limit=args.time_limit,
+                                 max_solutions=args.max_solutions or None,
+                                 title=args.date.strftime("%b %d %a").upper())
+        print(f"Wrote {args.output} ({events:,} events, {os.path.getsize(args.output):,} bytes)")  # noqa: E501
+        return 0
+
+    summary = summarize(*read_trace(args.trace))
+    print(format_report(summary, args.top))
+    if args.folded:
+        with open(args.folded, "w") as f:
+            f.write("\n".join(folded_stacks(summary)) + "\n")
+    if args.svg:
+        write_svg(summary, args.svg)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
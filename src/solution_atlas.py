@@ -0,0 +1,155 @@
+# Precomputed solution atlas for every (month, day, weekday) label triple.
+# The file is memory-mapped, so a lookup only touches one date's slice.
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+ATLAS_MAGIC = b"CCAT"
+ATLAS_VERSION = 2
+NUM_MONTHS = 12
+NUM_DAYS = 31
+NUM_WEEKDAYS = 7
+NUM_KEYS = NUM_MONTHS * NUM_DAYS * NUM_WEEKDAYS
+
+# magic, version, pieces per solution, layout fingerprint, placements, keys
+HEADER = struct.Struct("<4sHH16sII")
+# byte offset of the date's first solution, number of solutions; the top
+# bit of the count is set when the slot holds every solution of its date
+INDEX_ENTRY = struct.Struct("<QI")
+COMPLETE_BIT = 0x80000000
+DATA_START = HEADER.size + NUM_KEYS * INDEX_ENTRY.size
+
+DEFAULT_ATLAS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "solution_atlas.bin"
+)
+
+
+def atlas_key(month_idx, day, weekday_idx):
+    """Map a 0-based month, 1-based day and 0-based weekday to a slot index."""
+    if not (0 <= month_idx < NUM_MONTHS and 1 <= day <= NUM_DAYS and 0 <= weekday_idx < NUM_WEEKDAYS):  # noqa: E501
+        raise ValueError(f"No atlas slot for ({month_idx}, {day}, {weekday_idx})")
+    return (month_idx * NUM_DAYS + (day - 1)) * NUM_WEEKDAYS + weekday_idx
+
+
+def _to_le_u16(values):
+    arr = array("H", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_atlas(path, fingerprint, num_pieces, num_placements, solutions_by_key):
+    """Stream an atlas to `path`.
+
+    `solutions_by_key` yields, for every slot in key order, a
+    (complete, solutions) pair: the solutions are sequences of `num_pieces`
+    placement indices, and `complete` says they are all of the date's.
+    """
+    if num_placements > 0xFFFF:
+        raise ValueError("Placement indices do not fit in 16 bits")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    index = []
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, num_pieces, fingerprint, num_placements, NUM_KEYS))  # noqa: E501
+        f.write(b"\0" * (NUM_KEYS * INDEX_ENTRY.size))
+        offset = DATA_START
+        for complete, sols in solutions_by_key:
+            if len(sols) >= COMPLETE_BIT:
+                raise ValueError("Too many solutions for one slot")
+            index.append((offset, len(sols) | (COMPLETE_BIT if complete else 0)))
+            for sol in sols:
+                if len(sol) != num_pieces:
+                    raise ValueError("Every solution must place every piece")
+                f.write(_to_le_u16(sol))
+            offset += len(sols) * num_pieces * 2
+        if len(index) != NUM_KEYS:
+            raise ValueError(f"Expected {NUM_KEYS} slots, got {len(index)}")
+        f.seek(HEADER.size)
+        f.write(b"".join(INDEX_ENTRY.pack(off, count) for off, count in index))
+    os.replace(tmp_path, path)
+
+
+class SolutionAtlas:
+    """Read-only, memory-mapped view of an atlas file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < DATA_START:
+            self.close()
+            raise ValueError(f"{path} is too small to be a solution atlas")
+        magic, version, num_pieces, fingerprint, num_placements, num_keys = HEADER.unpack_from(self._mm, 0)  # noqa: E501
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION or num_keys != NUM_KEYS:
+            self.close()
+            raise ValueError(f"{path} is not a version {ATLAS_VERSION} solution atlas")
+        self.num_pieces = num_pieces
+        self.fingerprint = fingerprint
+        self.num_placements = num_placements
+
+    def _entry(self, key):
+        offset, count = INDEX_ENTRY.unpack_from(self._mm, HEADER.size + key * INDEX_ENTRY.size)
+        return offset, count & ~COMPLETE_BIT, bool(count & COMPLETE_BIT)
+
+    def count(self, key):
+        return self._entry(key)[1]
+
+    def complete(self, key):
+        """Whether slot `key` holds every solution of its date."""
+        return self._entry(key)[2]
+
+    def solutions(self, key):
+        """Return the placement-index tuples stored for slot `key`."""
+        offset, count, _ = self._entry(key)
+        n = self.num_pieces
+        values = array("H")
+        values.frombytes(self._mm[offset:offset + count * n * 2])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return [tuple(values[i:i + n]) for i in range(0, len(values), n)]
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the Caesar's Calendar solution atlas.")
+    parser.add_argument("--output", default=DEFAULT_ATLAS_PATH, help="atlas file to write")
+    parser.add_argument("--max-solutions", type=int, default=500, help="solutions kept per date (0 = all)")  # noqa: E501
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per date")
+    args = parser.parse_args(argv)
+
+    import puzzle_core as core
+
+    start = time.time()
+
+    def progress(month, day, weekday, count):
+        if day == NUM_DAYS and weekday == core.WEEKDAYS[-1]:
+            print(f"{month} done ({time.time() - start:.1f}s)", flush=True)
+
+    core.build_solution_atlas(
+        args.output,
+        max_solutions=args.max_solutions or None,
+        time_limit=args.time_limit,
+        progress=progress,
+    )
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# Two-tier cache of solved dates: an in-memory LRU in front of a SQLite file.
+# Keys start with the layout fingerprint, so changing the board or the piece
+# set stops old entries from ever matching; they just age out.
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "solution_cache.sqlite3"
+)
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def cache_key(fingerprint, cells):
+    """Key for a layout fingerprint and a set of uncovered cells."""
+    return fingerprint.hex() + ":" + ";".join(f"{x},{y}" for x, y in sorted(cells))
+
+
+def _pack(solutions):
+    values = array("H", [idx for sol in solutions for idx in sol])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(data, num_pieces):
+    if not data:
+        return []
+    values = array("H")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return [tuple(values[i:i + num_pieces]) for i in range(0, len(values), num_pieces)]
+
+
+class SolutionCache:
+    """Solutions (placement-index tuples) per key, plus a `complete` flag.
+
+    `complete` means the list holds every solution, not just the first few.
+    The memory tier keeps the `memory_entries` most recently used keys; the
+    SQLite tier drops least recently used rows once their data passes
+    `max_bytes`. With `path=None` only the memory tier is used.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Auto-Solve uses its own cache in the solver process (see
+        # puzzle_core.get_solution_cache); solver_service shares one between
+        # the threads of its event loop's default executor. The connection
+        # allows any thread (check_same_thread=False), so the lock keeps the
+        # memory tier and the database in step.
+        self._lock = threading.Lock()
+        self._db = None
+        self._bytes = 0
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                " key TEXT PRIMARY KEY, complete INTEGER NOT NULL,"
+                " num_pieces INTEGER NOT NULL, data BLOB NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS by_last_used ON solutions (last_used)")
+            self._db.commit()
+            # Kept up to date by put(), so eviction never has to scan the table.
+            self._bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM solutions"
+            ).fetchone()[0]
+
+    def get(self, key):
+        """Return (complete, solutions) for `key`, or None."""
+        with self._lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT complete, num_pieces, data FROM solutions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._db.commit()
+                    entry = (bool(row[0]), _unpack(row[2], row[1]))
+                    self._remember(key, entry)
+                    self.disk_hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, key, complete, solutions, num_pieces):
+        """Store `solutions`, each a tuple of `num_pieces` placement indices.
+
+        `num_pieces` comes from the layout, not the solutions, so an empty
+        list reads back from disk like any other entry.
+        """
+        solutions = [tuple(sol) for sol in solutions]
+        entry = (bool(complete), solutions)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                data = _pack(solutions)
+                old = self._db.execute(
+                    "SELECT LENGTH(data) FROM solutions WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)",
+                    (key, int(complete), num_pieces, data, time.time()),
+                )
+                self._bytes += len(data) - (old[0] if old else 0)
+                self._evict()
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, LENGTH(data) FROM solutions ORDER BY last_used").fetchall()  # noqa: E501
+        for key, size in rows:
+            if self._bytes <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM solutions WHERE key = ?", (key,))
+            self.memory.pop(key, None)
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_entries": len(self.memory),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,221 @@
+# Local HTTP/JSON solver service for several clients at once (stdlib only).
+# Searches run in a process pool so the event loop never blocks; concurrent
+# requests for the same date share one search, and results are cached.
+import argparse
+import asyncio
+import datetime
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import batch_solver
+import puzzle_core as core
+import solution_cache
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_SOLUTIONS = 100
+LATENCY_WINDOW = 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+def _search(forbidden, time_limit, max_solutions):
+    """Worker side: (solutions, complete) for one set of uncovered cells."""
+    solver, row_map = core.build_exact_cover(forbidden)
+    sols = core.solutions_from_rows(row_map, solver.solve_all(time_limit, max_solutions))
+    complete = solver.stopped is None and (max_solutions is None or len(sols) < max_solutions)
+    return sols, complete
+
+
+class SolverService:
+    """Serves GET /solve?date=YYYY-MM-DD[&max_solutions=N] and GET /stats.
+
+    Requests with the same (date, max_solutions) that arrive while a search
+    is running wait on that search instead of starting their own. Finished
+    searches go into a SolutionCache (memory-only unless `cache_path` is
+    given); searches cut short by `time_limit` are returned but not cached.
+    """
+
+    def __init__(self, max_workers=None, time_limit=10.0, cache_path=None):
+        self.time_limit = time_limit
+        # Spawned, not forked: a forked worker would inherit the open client
+        # sockets and keep those connections from closing.
+        self.pool = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))  # noqa: E501
+        self.cache = solution_cache.SolutionCache(path=cache_path)
+        self.in_flight = {}
+        self.requests = 0
+        self.searches = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.waiting = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.server = None
+
+    async def solve(self, day, max_solutions):
+        """Solutions for `day` as a JSON-ready dict."""
+        forbidden = set(core.get_date_labels(day))
+        if None in forbidden:
+            raise ValueError(f"{day} has no cells on this board")
+        record = {"date": day.isoformat(), "weekday": day.strftime("%a").upper()}
+        # Cache reads and writes may hit SQLite, so they run on the default
+        # thread pool; SolutionCache's lock serialises them.
+        loop = asyncio.get_running_loop()
+        sols = await loop.run_in_executor(
+            None, core.lookup_cached_solutions, forbidden, max_solutions, self.cache
+        )
+        if sols is not None:
+            self.cache_hits += 1
+            source = "cache"
+        else:
+            key = (day, max_solutions)
+            search = self.in_flight.get(key)
+            if search is None:
+                self.searches += 1
+                source = "search"
+                search = loop.run_in_executor(self.pool, _search, forbidden, self.time_limit, max_solutions)  # noqa: E501
+                self.in_flight[key] = search
+                search.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            else:
+                self.coalesced += 1
+                source = "coalesced"
+            self.waiting += 1
+            try:
+                sols, complete = await asyncio.shield(search)
+            finally:
+                self.waiting -= 1
+            if source == "search" and (complete or len(sols) == max_solutions):
+                await loop.run_in_executor(
+                    None, core.store_cached_solutions, forbidden, sols, complete, self.cache
+                )
+        return dict(record, source=source, count=len(sols),
+                    solutions=[batch_solver.solution_json(sol) for sol in sols])
+
+    def stats(self):
+        """Request counters, queue depth and latency over the last requests."""
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "requests": self.requests,
+            "searches": self.searches,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "searches_in_flight": len(self.in_flight),
+            "requests_waiting": self.waiting,
+            "latency_ms": {
+                "count": len(latencies),
+                "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "p50": pct(0.5) if latencies else None,
+                "p95": pct(0.95) if latencies else None,
+                "max": latencies[-1] if latencies else None,
+            },
+            "cache": self.cache.stats(),
+        }
+
+    async def respond(self, method, target):
+        """(status, JSON body) for one request."""
+        url = urlsplit(target)
+        if url.path not in ("/solve", "/stats"):
+            return 404, {"error": f"no such endpoint: {url.path}"}
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+        if url.path == "/stats":
+            return 200, self.stats()
+        query = parse_qs(url.query)
+        try:
+            day = datetime.date.fromisoformat(query.get("date", [""])[0])
+            max_solutions = int(query.get("max_solutions", [DEFAULT_MAX_SOLUTIONS])[0])
+            if max_solutions < 0:
+                raise ValueError("max_solutions must be 0 (no limit) or more")
+            return 200, await self.solve(day, max_solutions or None)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"search failed: {e!r}"}
+
+    async def handle(self, reader, writer):
+        start = time.perf_counter()
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass  # headers are not needed
+            if len(request_line) != 3:
+                status, body = 400, {"error": "malformed request"}
+            else:
+                self.requests += 1
+                status, body = await self.respond(request_line[0], request_line[1])
+            data = json.dumps(body, separators=(",", ":")).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.latencies.append((time.perf_counter() - start) * 1000)
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening; port 0 picks a free port (see `port`)."""
+        # Build the placement table cache lookups decode against up front,
+        # so the first request doesn't pay for it.
+        await asyncio.get_running_loop().run_in_executor(None, core.all_placements)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # Cancelling a search also cancels its pool future if it has not
+        # started; done by hand as shutdown(cancel_futures=True) needs 3.9.
+        searches = list(self.in_flight.values())
+        for search in searches:
+            search.cancel()
+        await asyncio.gather(*searches, return_exceptions=True)
+        self.pool.shutdown()
+        self.cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Auto-Solve results over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")  # noqa: E501
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds per search")
+    parser.add_argument("--cache-file", default=None,
+                        help="SQLite file to keep results in (default: memory only)")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = SolverService(args.workers, args.time_limit, args.cache_file)
+        await service.start(args.host, args.port)
+        print(f"Serving on http://{args.host}:{service.port}/solve?date=YYYY-MM-DD", flush=True)
+        try:
+            await service.server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,20 @@
 """
 Simple tests to verify the refactored code maintains functionality.
 """
+import datetime
 import sys
 import os
+import time
 import pygame
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-# Initialize pygame before importing the module
-pygame.init()
-
-# Import after pygame.init()
 import caldendar_puzzle as cp
 
+# Importing opens no window; the tests draw into the one init_window() opens.
+cp.init_window()
+
 
 def test_font_scale_constants():
     """Test that all font scale constants are defined."""
@@ -48,6 +49,27 @@ def test_create_scaled_font():
     print("✓ create_scaled_font() works correctly")
 
 
+def test_font_and_text_cache():
+    """Test the LRU caches behind choose_font() and render_text()."""
+    cache = cp.LRUCache(2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: None)
+    cache.get("c", lambda: 3)
+    assert list(cache.entries) == ["a", "c"], "Least recently used entry is evicted"
+    assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 1, "entries": 2, "hit_rate": 0.25}
+
+    assert cp.create_scaled_font(0.5) is cp.create_scaled_font(0.5), "Fonts are loaded once"
+    hits = cp.text_cache.hits
+    surf = cp.render_text("Test", 0.5, (255, 255, 255))
+    assert cp.render_text("Test", 0.5, (255, 255, 255)) is surf, "Text is rendered once"
+    assert cp.text_cache.hits == hits + 1
+    assert cp.render_text("Test", 0.5, (0, 0, 0)) is not surf, "Color is part of the key"
+    assert cp.render_text("Test", 0.5, (255, 255, 255), bold=True) is not surf
+
+    print("✓ Font and text caches work")
+
+
 def test_get_piece_dimensions():
     """Test the get_piece_dimensions helper function."""
     # Test with PIECES_BASE
@@ -136,6 +158,104 @@ def test_draw_button():
     print("✓ draw_button() works correctly")
 
 
+def test_board_layer_cache():
+    """Test that the board layer is only redrawn for a new theme or cell size."""
+    layer = cp.get_board_layer()
+    assert layer.get_size() == (cp.GRID_W * cp.CELL, cp.GRID_H * cp.CELL)
+    assert cp.get_board_layer() is layer, "Same theme and size reuse the layer"
+
+    old_theme, old_cell = cp.theme_idx, cp.CELL
+    try:
+        cp.theme_idx = (old_theme + 1) % len(cp.THEMES)
+        cp.apply_theme()
+        themed = cp.get_board_layer()
+        assert themed is not layer, "A theme switch redraws the board"
+        cp.CELL = old_cell + 10
+        assert cp.get_board_layer().get_width() == cp.GRID_W * cp.CELL, "A new cell size too"
+    finally:
+        cp.theme_idx, cp.CELL = old_theme, old_cell
+        cp.apply_theme()
+
+    print("✓ Board layer is cached per theme and cell size")
+
+
+def test_piece_tiles():
+    """Test that piece tiles are baked once per theme and cell size."""
+    tiles = cp.get_piece_tiles()
+    assert set(tiles) == set(cp.PIECE_COLORS), "One tile per piece color"
+    assert all(t.get_size() == (cp.CELL, cp.CELL) for t in tiles.values())
+    assert cp.get_piece_tiles() is tiles, "Tiles are reused between frames"
+
+    old_theme = cp.theme_idx
+    try:
+        for idx in range(len(cp.THEMES)):
+            cp.theme_idx = idx
+            cp.apply_theme()
+            themed = cp.get_piece_tiles()
+            assert set(themed) == set(cp.PIECE_COLORS), f"{cp.THEMES[idx]['name']} tiles baked"
+            cp.draw_pieces(pygame.Surface((1000, 600)), highlight_idx=0)
+        assert themed is not tiles, "A theme switch bakes new tiles"
+    finally:
+        cp.theme_idx = old_theme
+        cp.apply_theme()
+
+    print("✓ Piece tiles are baked per theme and cell size")
+
+
+def test_dirty_rects():
+    """Test that only changed pieces and HUD text are marked dirty."""
+    prev = cp.frame_snapshot()
+    full = [cp.screen.get_rect()]
+    assert cp.dirty_rects(None, prev, {}, {}) == full, "First frame is drawn in full"
+    assert cp.dirty_rects(prev, cp.frame_snapshot(), {}, {}) == [], "Nothing changed"
+
+    pl = cp.placed[0]
+    old_cells = pl["cells"]
+    try:
+        pl["cells"] = [(x + 1, y) for x, y in old_cells]
+        rects = cp.dirty_rects(prev, cp.frame_snapshot(), {}, {})
+        assert len(rects) == 2 * len(old_cells), "Old and new cells of the moved piece"
+        assert pygame.Rect(cp.cell_to_screen(*old_cells[0]), (cp.CELL, cp.CELL)) in rects
+    finally:
+        pl["cells"] = old_cells
+
+    old_rect, new_rect = pygame.Rect(500, 10, 80, 20), pygame.Rect(490, 10, 90, 20)
+    cur = (prev[0], prev[1], dict(prev[2], timer="Time: 0:01.00"))
+    assert cp.dirty_rects(prev, cur, {"timer": old_rect}, {"timer": new_rect}) == [old_rect, new_rect]  # noqa: E501
+    resized = (((1, 1),) + prev[0][1:], prev[1], prev[2])
+    assert cp.dirty_rects(prev, resized, {}, {}) == full, "A new scene is redrawn in full"
+
+    print("✓ Dirty rectangles cover moved pieces and changed HUD text")
+
+
+def test_confetti():
+    """Test the numpy confetti buffers: motion, respawn and drawing."""
+    import numpy as np
+
+    c = cp.Confetti(500, 200, 100, rng=np.random.default_rng(1))
+    assert len(c.x) == len(c.ttl) == len(c.sprite) == 500
+    assert (c.y <= 0).all() and (c.y >= -50).all(), "Particles start above the window"
+    y, ttl = c.y.copy(), c.ttl.copy()
+    c.update(200, 100)
+    assert np.allclose(c.y, y + c.dy), "Every particle falls by its own speed"
+    assert (c.ttl == ttl - 1).all()
+
+    c.ttl[:10] = 1
+    c.update(200, 100)
+    assert (c.ttl[:10] >= 30).all(), "Expired particles respawn"
+    for _ in range(30):
+        c.update(200, 100)
+    surface = pygame.Surface((200, 100))
+    c.draw(surface)
+    assert surface.get_bounding_rect().width > 0, "Visible particles are drawn"
+
+    cp.spawn_confetti(surface, n=50)
+    cp.update_confetti(surface)
+    assert len(cp.confetti.x) == 50
+
+    print("✓ Confetti particles move, respawn and draw")
+
+
 def test_themes_exist():
     """Test that all three themes are properly defined."""
     assert len(cp.THEMES) == 3, "Should have 3 themes"
@@ -176,6 +296,83 @@ def test_layout_computation():
     print(f"✓ Layout computation works (cell={layout['cell']}, rows={layout['palette_rows']}, cols={layout['palette_cols']})")
 
 
+def test_solver_stats_text():
+    """Test the lines shown by the solver stats overlay."""
+    import puzzle_core
+
+    assert len(cp.format_solver_stats(None)) == 1, "Atlas/cache hits have no stats"
+    stats = puzzle_core.SearchStats()
+    stats.record_node(0, 3)
+    stats.record_node(1, 0)
+    stats.record_solution()
+    lines = cp.format_solver_stats(stats)
+    assert len(lines) == 3, "Overlay shows counts, timing, branching"
+    assert "Dead ends 1" in lines[0]
+    assert lines[2].endswith("3.0 0.0"), "Mean branching per depth"
+
+    print("✓ Solver stats overlay text is formatted correctly")
+
+
+def test_solver_progress_text():
+    """Test the live progress line shown while Auto-Solve searches."""
+    import puzzle_core
+
+    assert cp.format_solver_progress(None) == "Starting search..."
+    progress = {"solutions": 12, "nodes": 34567, "elapsed": 1.25, "remaining": None}
+    assert cp.format_solver_progress(progress) == "12 found   34,567 nodes   1.2 s"
+    progress["remaining"] = puzzle_core.estimate_remaining(12, 1.25, time_limit=10.0, max_solutions=500)  # noqa: E501
+    assert cp.format_solver_progress(progress).endswith("~8.8 s left"), "Time limit comes first"
+    assert puzzle_core.estimate_remaining(100, 1.0, time_limit=10.0, max_solutions=500) == 4.0
+    assert puzzle_core.estimate_remaining(0, 1.0) is None, "No limits, no estimate"
+
+    print("✓ Solver progress text is formatted correctly")
+
+
+def _exit_without_done(forbidden, out, cancel):
+    """Stand-in worker that dies before putting DONE."""
+
+
+def test_auto_solve_worker_exit():
+    """Test that a solver process exiting without DONE stops the search."""
+    cp.solver_queue = cp.SOLVER_CONTEXT.Queue()
+    cp.solver_cancel = cp.ProcessCancelToken(cp.SOLVER_CONTEXT)
+    cp.solver_process = cp.SOLVER_CONTEXT.Process(
+        target=_exit_without_done, args=(set(), cp.solver_queue, cp.solver_cancel), daemon=True
+    )
+    cp.solving = True
+    cp.solver_process.start()
+    cp.solver_process.join()
+    cp.poll_auto_solve()
+    assert not cp.solving, "A dead worker must not leave Auto-Solve solving"
+    assert cp.solver_process is None and cp.solver_queue is None
+    print("✓ Auto-Solve stops when the worker exits without DONE")
+
+
+def test_cancel_auto_solve_reaps_process():
+    """Test that cancelling Auto-Solve returns at once and the child stops on its own."""
+    forbidden = set(cp.get_date_labels(datetime.date(2026, 11, 7)))  # NOV 7 SAT, a slow date
+    cp.solver_queue = cp.SOLVER_CONTEXT.Queue()
+    cp.solver_cancel = cp.ProcessCancelToken(cp.SOLVER_CONTEXT)
+    process = cp.solver_process = cp.SOLVER_CONTEXT.Process(
+        target=cp.solve_worker, args=(forbidden, cp.solver_queue, cp.solver_cancel),
+        kwargs={"max_solutions": None, "use_cache": False}, daemon=True
+    )
+    cp.solving = True
+    process.start()
+    time.sleep(0.3)  # let the search get going
+    start = time.perf_counter()
+    cp.cancel_auto_solve()
+    assert time.perf_counter() - start < 0.05, "Cancelling should not wait for the child"
+    assert not cp.solving and cp.solver_process is None
+    while cp.retired_solvers and time.perf_counter() - start < 5:
+        cp.poll_auto_solve()
+        time.sleep(0.01)
+    assert not cp.retired_solvers and not process.is_alive(), "Cancelled child should be reaped"
+    assert process.exitcode == 0, "Child should stop through the cancel token, not terminate()"
+    assert time.perf_counter() - start < cp.SOLVER_JOIN_TIMEOUT, "Child should stop before the timeout"
+    print("✓ Cancelling Auto-Solve stops and reaps the solver process")
+
+
 def run_all_tests():
     """Run all tests."""
     print("\n=== Running Refactoring Tests ===\n")
@@ -183,13 +380,22 @@ def run_all_tests():
     try:
         test_font_scale_constants()
         test_create_scaled_font()
+        test_font_and_text_cache()
         test_get_piece_dimensions()
         test_compute_best_cell_size()
         test_timer_helpers()
         test_button_theme_colors()
         test_draw_button()
+        test_board_layer_cache()
+        test_piece_tiles()
+        test_dirty_rects()
+        test_confetti()
         test_themes_exist()
         test_layout_computation()
+        test_solver_stats_text()
+        test_solver_progress_text()
+        test_auto_solve_worker_exit()
+        test_cancel_auto_solve_reaps_process()
         
         print("\n=== ✅ All Tests Passed! ===\n")
         return 0
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Tests for the exact-cover auto-solver backends.
+"""
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import puzzle_core as core
+import solution_atlas
+
+
+def forbidden_for(month, day, weekday):
+    """Return the three uncovered cells for the given labels."""
+    wanted = {("month", month), ("date", str(day)), ("weekday", weekday)}
+    return {pos for pos, info in core.cell_label.items() if (info["type"], info["text"]) in wanted}
+
+
+def solution_key(sol):
+    return tuple((x0, y0, tuple(sorted(cells))) for x0, y0, _, _, cells in sol)
+
+
+def test_cells_to_mask():
+    """Test packing cells into a board bitmask."""
+    assert core.cells_to_mask([]) == 0
+    assert core.cells_to_mask([(0, 0)]) == 1
+    assert core.cells_to_mask([(1, 0), (0, 1)]) == (1 << 1) | (1 << core.GRID_W)
+    free = core.cells_to_mask([(0, 0), (2, 0), (3, 0)])
+    assert core.isolated_cells(free) == core.cells_to_mask([(0, 0)]), "Only (0, 0) is walled in"
+
+    print("✓ cells_to_mask() and isolated_cells() work correctly")
+
+
+def test_bitboard_solutions_cover_board():
+    """Test that every bitboard solution is an exact cover of the open cells."""
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    assert len(forbidden) == 3, "Should find all three label cells"
+    sols = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=50)
+    assert len(sols) == 50, "Should find the requested number of solutions"
+
+    for sol in sols:
+        assert len(sol) == len(core.pieces), "Every piece should be placed"
+        covered = [c for (_, _, _, _, cells) in sol for c in cells]
+        assert len(covered) == len(set(covered)), "Pieces should not overlap"
+        assert set(covered) == core.board_mask - forbidden, "Only the date should stay visible"
+
+    print(f"✓ Bitboard engine returns exact covers ({len(sols)} checked)")
+
+
+def test_bitboard_matches_dlx():
+    """Test that both engines agree on the solutions they find."""
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    every = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=None)
+    some = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=30, engine="dlx")
+    assert len(some) == 30, "DLX should find the requested number of solutions"
+
+    every_keys = {solution_key(s) for s in every}
+    assert len(every_keys) == len(every), "Solutions should be distinct"
+    for sol in some:
+        assert solution_key(sol) in every_keys, "DLX solution missing from bitboard results"
+
+    print(f"✓ Bitboard and DLX engines agree ({len(every)} solutions)")
+
+
+def test_solution_atlas_round_trip():
+    """Test writing an atlas and reading one date's slice back."""
+    import tempfile
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    key = core.atlas_key_for_cells(forbidden)
+    assert key == solution_atlas.atlas_key(9, 16, 5), "Should map labels to the right slot"
+    sols = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=5)
+    packed = [core.solution_to_indices(sol) for sol in sols]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "atlas.bin")
+        solution_atlas.write_atlas(
+            path, core.layout_fingerprint(), len(core.pieces), len(core.all_placements()),
+            ((False, packed) if k == key else (True, []) for k in range(solution_atlas.NUM_KEYS)),
+        )
+        with solution_atlas.SolutionAtlas(path) as atlas:
+            assert atlas.fingerprint == core.layout_fingerprint(), "Fingerprint should round-trip"
+            assert atlas.count(key) == len(sols), "Should store every solution"
+            assert not atlas.complete(key) and atlas.complete(key + 1), "Should keep complete flags"
+            assert atlas.count(key + 1) == 0, "Other slots should be empty"
+            unpacked = [core.solution_from_indices(s) for s in atlas.solutions(key)]
+            old_atlas, core._atlas = core._atlas, atlas
+            try:
+                assert core.lookup_atlas_solutions(forbidden, 3) == sols[:3]
+                assert core.lookup_atlas_solutions(forbidden, 6) is None, "Truncated slot needs a search"
+                assert core.lookup_atlas_solutions(forbidden) is None, "Truncated slot needs a search"
+            finally:
+                core._atlas = old_atlas
+    assert unpacked == sols, "Solutions should decode to the original placements"
+
+    print(f"✓ Solution atlas round-trips ({len(sols)} solutions)")
+
+
+def test_batch_solve_dates():
+    """Test that the process-pool batch solver covers every requested date."""
+    import datetime
+    import batch_solver
+
+    dates = list(batch_solver.date_range(datetime.date(2026, 3, 1), datetime.date(2026, 3, 3)))
+    assert len(dates) == 3, "date_range() should be inclusive"
+
+    results = list(batch_solver.solve_dates(dates, max_workers=2, max_solutions=5))
+    assert sorted(day for day, _, _ in results) == dates, "Every date should be solved once"
+    for day, sols, elapsed in results:
+        assert len(sols) == 5, f"{day} should have solutions"
+        assert elapsed >= 0, "Should report solve time"
+
+    print(f"✓ Batch solver handles {len(dates)} dates")
+
+
+def test_batch_jsonl():
+    """Test the JSON lines written by batch_solver.py --jsonl."""
+    import datetime
+    import io
+    import json
+    import batch_solver
+    from contextlib import redirect_stderr, redirect_stdout
+
+    out = io.StringIO()
+    with redirect_stdout(out), redirect_stderr(io.StringIO()):
+        status = batch_solver.main(["--from", "2026-03-01", "--to", "2026-03-03", "--workers", "1",
+                                    "--max-solutions", "3", "--jsonl"])
+    assert status == 0, "Every date has a solution"
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["date"] for r in records] == ["2026-03-01", "2026-03-02", "2026-03-03"]
+    assert all(r["count"] == len(r["solutions"]) == 3 for r in records)
+    pieces = records[0]["solutions"][0]
+    assert [p["piece"] for p in pieces] == list(range(len(core.pieces))), "Pieces in order"
+
+    day = datetime.date(2026, 3, 1)
+    sols = core.dlx_build_and_solve_all(set(core.get_date_labels(day)), max_solutions=2)
+    lines = list(batch_solver.jsonl_lines(day, sols, 0.0, per_solution=True))
+    assert [json.loads(line)["index"] for line in lines] == [0, 1], "One line per solution"
+    assert json.loads(next(batch_solver.jsonl_lines(day, 5, 0.0)))["count"] == 5
+
+    print(f"✓ Batch solver streams JSON lines ({len(records)} dates)")
+
+
+def test_solver_service():
+    """Test the local solver service: coalescing, caching and stats."""
+    import asyncio
+    import json
+    import solver_service
+
+    async def fetch(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        data = await reader.read()
+        writer.close()
+        head, body = data.split(b"\r\n\r\n", 1)
+        return int(head.split()[1]), json.loads(body)
+
+    async def run():
+        service = solver_service.SolverService(max_workers=1)
+        await service.start(port=0)
+        try:
+            path = "/solve?date=2026-03-01&max_solutions=3"
+            first = await asyncio.gather(*(fetch(service.port, path) for _ in range(3)))
+            again = await fetch(service.port, path)
+            errors = [await fetch(service.port, p) for p in
+                      ("/solve?date=tomorrow", "/solve?date=2026-03-01&max_solutions=-1", "/nope")]
+            stats = (await fetch(service.port, "/stats"))[1]
+
+            async def broken_solve(day, max_solutions):
+                raise RuntimeError("worker died")
+
+            service.solve = broken_solve
+            failed = await service.respond("GET", path)
+        finally:
+            await service.close()
+        return first, again, errors, stats, failed
+
+    first, again, errors, stats, failed = asyncio.run(run())
+    assert all(status == 200 and body["count"] == 3 for status, body in first)
+    assert sorted(body["source"] for _, body in first) == ["coalesced", "coalesced", "search"]
+    assert again[1]["source"] == "cache" and again[1]["solutions"] == first[0][1]["solutions"]
+    assert [status for status, _ in errors] == [400, 400, 404]
+    assert failed[0] == 500 and "worker died" in failed[1]["error"], "Search errors answer 500"
+    assert (stats["searches"], stats["coalesced"], stats["cache_hits"]) == (1, 2, 1)
+    assert stats["requests"] == 8 and stats["latency_ms"]["count"] == 7
+    assert stats["searches_in_flight"] == stats["requests_waiting"] == 0
+
+    print("✓ Solver service coalesces and caches requests")
+
+
+def test_solve_worker():
+    """Test the Auto-Solve worker process and its compact message encoding."""
+    import multiprocessing
+
+    forbidden = forbidden_for("JAN", 1, "THU")
+    expected = core.dlx_build_and_solve_all(forbidden, max_solutions=5)
+    assert core.decode_solutions(core.encode_solutions(expected)) == expected
+
+    ctx = multiprocessing.get_context()
+    out = ctx.Queue()
+    cancel = core.ProcessCancelToken(ctx)
+    worker = ctx.Process(target=core.solve_worker, args=(forbidden, out, cancel),
+                         kwargs={"max_solutions": 5, "use_cache": False, "progress_every": 0})
+    worker.start()
+    received = []
+    progress = []
+    msg = out.get(timeout=30)
+    while msg[0] != core.DONE:
+        if msg[0] == core.SOLUTIONS:
+            received.extend(core.decode_solutions(msg[1]))
+        else:
+            progress.append(msg[1])
+        msg = out.get(timeout=30)
+    worker.join()
+    assert msg[1] is None, "The search finished"
+    assert progress and progress[-1]["nodes"] >= core.SearchBudget.check_every, "Progress is reported"  # noqa: E501
+    assert [p["solutions"] for p in progress] == sorted(p["solutions"] for p in progress)
+    assert msg[2].nodes > 0 and len(msg[2].solution_times) == 5, "Stats come back with it"
+    assert [solution_key(s) for s in received] == [solution_key(s) for s in expected]
+
+    out = ctx.Queue()
+    cancel = core.ProcessCancelToken(ctx)
+    cancel.cancel()
+    worker = ctx.Process(target=core.solve_worker, args=(forbidden, out, cancel),
+                         kwargs={"max_solutions": None, "use_cache": False})
+    worker.start()
+    worker.join(timeout=30)
+    assert worker.exitcode == 0 and out.empty(), "A cancelled worker exits quietly"
+
+    print(f"✓ Solve worker streams solutions from a child process ({len(received)} solutions, "
+          f"{len(progress)} progress reports)")
+
+
+def test_parallel_matches_serial():
+    """Test that splitting the search tree across processes loses nothing."""
+    import multiprocessing
+
+    import batch_solver
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    serial = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=None)
+    parallel = batch_solver.solve_parallel(forbidden, max_workers=2, split_depth=2)
+    assert parallel == serial, "Parallel enumeration should match the serial one"
+
+    capped = batch_solver.solve_parallel(forbidden, max_solutions=7, max_workers=2)
+    assert len(capped) == 7, "max_solutions should apply to the whole search"
+    assert not multiprocessing.active_children(), "No subtree should outlive the call"
+
+    pruned = batch_solver.solve_parallel(forbidden, max_workers=2, prune_regions=True)
+    assert pruned == serial, "Dead-region pruning should not change the solutions"
+
+    print(f"✓ Parallel search matches serial search ({len(serial)} solutions)")
+
+
+def test_dlx_subtree_restores_matrix():
+    """Test that DLX.solve_subtree() leaves the matrix reusable."""
+    forbidden = forbidden_for("JAN", 1, "THU")
+    dlx, _ = core.build_exact_cover(forbidden, engine="dlx")
+    prefixes = dlx.branch_prefixes(1)
+    assert prefixes, "Should have at least one branch"
+
+    first = [core.solution_row_ids(s) for s in dlx.solve_subtree(prefixes[0], max_solutions=5)]
+    again = [core.solution_row_ids(s) for s in dlx.solve_subtree(prefixes[0], max_solutions=5)]
+    assert first == again, "Repeated subtree searches should agree"
+    for sol in first:
+        assert sol[:len(prefixes[0])] == prefixes[0], "Solutions should extend the prefix"
+    assert dlx.branch_prefixes(1) == prefixes, "Matrix should be restored after the search"
+
+    print(f"✓ DLX subtree search restores the matrix ({len(prefixes)} branches)")
+
+
+def test_iter_solutions_streams():
+    """Test that the streaming search yields the same solutions, first one fast."""
+    import time
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    for engine in ("bitboard", "dlx"):
+        start = time.time()
+        stream = core.iter_solutions(forbidden, time_limit=None, engine=engine)
+        first = next(stream)
+        first_ms = (time.time() - start) * 1000
+        stream.close()
+        assert first_ms < 1000, f"{engine}: first solution took {first_ms:.0f} ms"
+
+        streamed = list(core.iter_solutions(forbidden, time_limit=None, max_solutions=40, engine=engine))
+        batch = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=40, engine=engine)
+        assert streamed == batch, f"{engine}: streaming should match solve_all() order"
+        assert first == batch[0], f"{engine}: first streamed solution should come first"
+
+    dlx, _ = core.build_exact_cover(forbidden, engine="dlx")
+    sizes = [c.size for c in dlx.columns]
+    stream = dlx.iter_solutions()
+    next(stream)
+    next(stream)
+    stream.close()
+    assert [c.size for c in dlx.columns] == sizes, "Closing early should restore the matrix"
+
+    print(f"✓ iter_solutions() streams solutions (first after {first_ms:.1f} ms)")
+
+
+def test_search_budget():
+    """Test node budgets and cancellation on both engines."""
+    import threading
+    import time
+
+    forbidden = forbidden_for("JAN", 1, "THU")
+    for engine in ("bitboard", "dlx", "dlx-array"):
+        solver, _ = core.build_exact_cover(forbidden, engine)
+        solver.solve_all(max_nodes=3000)
+        assert solver.nodes == 3000, f"{engine}: should stop exactly at the node budget"
+        assert solver.stopped == "nodes", f"{engine}: should report why it stopped"
+
+        token = core.CancelToken()
+        token.cancel()
+        sols = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=None,
+                                          engine=engine, cancel=token)
+        assert len(sols) < 50, f"{engine}: a cancelled search should stop almost at once"
+
+    token = core.CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    start = time.time()
+    core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=None, cancel=token)
+    elapsed = time.time() - start
+    assert elapsed < 1.0, f"Cancelling from another thread took {elapsed:.2f}s"
+
+    print(f"✓ Search budgets and cancellation work (stopped after {elapsed:.2f}s)")
+
+
+def test_count_solutions():
+    """Test that counting agrees with full enumeration, even with a tiny table."""
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    expected = len(core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=None))
+    assert core.count_solutions(forbidden) == expected, "Count should match enumeration"
+    assert core.count_solutions(forbidden, table_size=7) == expected, "Collisions must not change the count"
+
+    solver, _ = core.build_exact_cover(forbidden)
+    partial = solver.count_all(max_nodes=2000)
+    assert solver.stopped == "nodes", "Node budget should stop counting"
+    assert partial <= expected, "A stopped count is a lower bound"
+
+    print(f"✓ count_solutions() matches enumeration ({expected} solutions)")
+
+
+def test_dead_region_pruning():
+    """Test that dead-region pruning cuts branches without losing solutions."""
+    pruner = core.DeadRegionPruner([(1, 4), (2, 5)])
+    four = core.cells_to_mask([(0, 0), (1, 0), (2, 0), (3, 0)])
+    three = core.cells_to_mask([(5, 0), (6, 0), (7, 0)])
+    assert not pruner.dead(four, 0), "A 4-cell region fits the 4-cell piece"
+    assert pruner.dead(four | three, 0), "A 3-cell region can never be filled"
+    assert pruner.dead(four, 1), "Only the 5-cell piece is left"
+    assert (pruner.checks, pruner.pruned) == (3, 2), "Should count checks and cuts"
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    for engine in ("bitboard", "dlx"):
+        plain = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=30, engine=engine)
+        solver, row_map = core.build_exact_cover(forbidden, engine, prune_regions=True)
+        pruned = core.solutions_from_rows(row_map, solver.solve_all(max_solutions=30))
+        assert pruned == plain, f"{engine}: pruning should not change the solutions"
+        assert solver.pruner.pruned > 0, f"{engine}: pruning should cut some branches"
+
+    solver, _ = core.build_exact_cover(forbidden)
+    assert solver.pruner is None, "Pruning is off by default"
+
+    print("✓ Dead-region pruning keeps every solution")
+
+
+def test_compiled_placements():
+    """Test that filtering the compiled table matches generate_placements()."""
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    expected = [row for plist in core.generate_placements(forbidden) for row in plist]
+    _, row_map = core.build_exact_cover(forbidden)
+    assert row_map == expected, "Compiled rows should match a fresh enumeration"
+    for row, mask in core.compiled_placements():
+        assert mask == core.cells_to_mask(row[5]), "Masks should match placement cells"
+    assert core.compiled_placements() is core.compiled_placements(), "Table should be built once"
+
+    print(f"✓ Compiled placement table matches ({len(row_map)} rows for OCT 16)")
+
+
+def test_generate_placements_matches_scan():
+    """Test the vectorised placement search against a plain cell-by-cell scan."""
+    forbidden = forbidden_for("FEB", 29, "SUN")
+    placements = core.generate_placements(forbidden)
+    for pid, piece in enumerate(core.pieces):
+        expected = []
+        for rot, flip, shape in core.all_piece_orientations(piece["cells"]):
+            for x0 in range(core.GRID_W):
+                for y0 in range(core.GRID_H):
+                    cells = tuple((x0 + x, y0 + y) for x, y in shape)
+                    if all(c in core.board_mask and c not in forbidden for c in cells):
+                        expected.append((pid, rot, flip, x0, y0, cells))
+        assert placements[pid] == expected, f"Piece {pid} placements differ"
+
+    print(f"✓ generate_placements() matches a full scan ({sum(map(len, placements))} placements)")
+
+
+def test_solution_cache():
+    """Test the two cache tiers, eviction and invalidation on layout changes."""
+    import tempfile
+    import solution_cache
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        with solution_cache.SolutionCache(path) as cache:
+            first = core.cached_solve_all(forbidden, max_solutions=20, cache=cache)
+            again = core.cached_solve_all(forbidden, max_solutions=10, cache=cache)
+            assert again == first[:10], "A smaller request should be served from the cache"
+            assert (cache.misses, cache.memory_hits) == (1, 1), "Should count misses and hits"
+            more = core.cached_solve_all(forbidden, max_solutions=30, cache=cache)
+            assert len(more) == 30 and more[:20] == first, "A bigger request needs a fresh search"
+
+        with solution_cache.SolutionCache(path) as cache:
+            reopened = core.cached_solve_all(forbidden, max_solutions=20, cache=cache)
+            assert reopened == first, "Solutions should survive a restart"
+            assert cache.disk_hits == 1, "Should be read from the SQLite tier"
+
+        with solution_cache.SolutionCache(path) as cache:
+            cache.put("empty", False, [], len(core.pieces))
+            assert core.cached_solve_all(forbidden, max_solutions=0, cache=cache) == []
+        with solution_cache.SolutionCache(path) as cache:
+            assert cache.get("empty") == (False, []), "An empty entry should read back from disk"
+            assert cache.disk_hits == 1
+
+        with solution_cache.SolutionCache(path, max_bytes=1000) as cache:
+            cache.put("a", True, [(1, 2, 3)] * 100, 3)
+            cache.put("b", True, [(1, 2, 3)] * 100, 3)
+            assert cache.evictions >= 1, "Should evict once over the size limit"
+            assert cache.get("b") is not None, "The newest entry should survive"
+            cache.put("b", True, [(1, 2, 3)] * 10, 3)
+            assert cache._bytes == 60, "Replacing an entry should update the byte total"
+
+    cache = solution_cache.SolutionCache(path=None)
+    core.store_cached_solutions(forbidden, first, complete=False, cache=cache)
+    old_cells = core.pieces[0]["cells"]
+    core.pieces[0]["cells"] = old_cells[:-1]
+    try:
+        assert core.lookup_cached_solutions(forbidden, 5, cache) is None, "New pieces need new keys"
+    finally:
+        core.pieces[0]["cells"] = old_cells
+    assert core.lookup_cached_solutions(forbidden, 5, cache) == first[:5]
+
+    print(f"✓ Solution cache works ({cache.stats()})")
+
+
+def test_array_dlx_matches_dlx():
+    """Test that the array-backed DLX searches exactly like the linked-node one."""
+    forbidden = forbidden_for("JAN", 1, "THU")
+    dlx, _ = core.build_exact_cover(forbidden, engine="dlx")
+    flat, _ = core.build_exact_cover(forbidden, engine="dlx-array")
+    assert isinstance(flat.L, core.array), "Buffers should be int arrays at rest"
+
+    expected = [core.solution_row_ids(s) for s in dlx.solve_all(max_solutions=40)]
+    assert flat.solve_all(max_solutions=40) == expected, "Should find the same solutions in order"
+    assert flat.nodes == dlx.nodes, "Should visit the same nodes"
+    assert flat.branch_prefixes(2) == dlx.branch_prefixes(2), "Should branch the same way"
+
+    links = [bytes(buf) for buf in (flat.L, flat.R, flat.U, flat.D, flat.S)]
+    stream = flat.iter_solutions()
+    assert next(stream) == expected[0], "Should stream the first solution first"
+    stream.close()
+    assert [bytes(buf) for buf in (flat.L, flat.R, flat.U, flat.D, flat.S)] == links, \
+        "Closing early should restore the matrix"
+
+    print(f"✓ Array-backed DLX matches DLX ({len(expected)} solutions)")
+
+
+def test_benchmark_compare():
+    """Test that the benchmark flags regressions but tolerates noise."""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+    import bench_solver
+
+    base = {"solutions": 10, "build_ms": 4.0, "enumerate_s": 2.0, "nodes_per_sec": 30000}
+    baseline = {"engine": "bitboard", "dates": {"JAN-1-THU": base}}
+
+    def run(**changes):
+        return {"engine": "bitboard", "dates": {"JAN-1-THU": dict(base, **changes)}}
+
+    assert bench_solver.compare(run(build_ms=4.5), baseline) == [], "Small changes are noise"
+    assert len(bench_solver.compare(run(enumerate_s=3.0), baseline)) == 1, "Slower enumeration"
+    assert len(bench_solver.compare(run(nodes_per_sec=20000), baseline)) == 1, "Fewer nodes/s"
+    assert len(bench_solver.compare(run(solutions=9), baseline)) == 1, "Wrong solution count"
+    assert bench_solver.compare(run(enumerate_s=1.0), baseline) == [], "Faster is fine"
+
+    print("✓ Benchmark regression check works")
+
+
+def test_search_stats():
+    """Test that every engine collects matching search stats on request."""
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    for engine in ("bitboard", "dlx", "dlx-array"):
+        plain = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=30, engine=engine)
+        sols, stats = core.dlx_build_and_solve_all(forbidden, time_limit=None, max_solutions=30,
+                                                 engine=engine, collect_stats=True)
+        assert sols == plain, f"{engine}: stats should not change the solutions"
+        assert len(stats.solution_times) == 30, f"{engine}: one time per solution"
+        assert stats.first_solution_time <= stats.solution_times[-1]
+        assert stats.dead_ends == sum(level.get(0, 0) for level in stats.branching)
+        if engine != "bitboard":
+            assert stats.covers == stats.uncovers > 0, f"{engine}: every cover is undone"
+            solver, _ = core.build_exact_cover(forbidden, engine)
+            assert solver.enable_stats() is solver.enable_stats(), f"{engine}: one stats object"
+            solver.solve_all(max_solutions=30)
+            assert solver.stats.covers == stats.covers, f"{engine}: enabling twice counts once"
+
+        solver, row_map = core.build_exact_cover(forbidden, engine)
+        stats = solver.enable_stats()
+        streamed = [core.solutions_from_rows(row_map, [rows])[0]
+                    for rows in solver.iter_solutions(max_solutions=30)]
+        assert streamed == plain, f"{engine}: streaming with stats should match"
+        assert len(stats.solution_times) == 30, f"{engine}: streaming records solutions too"
+
+    solver, _ = core.build_exact_cover(forbidden)
+    assert solver.stats is None, "Stats are off by default"
+
+    print(f"✓ Search stats are collected ({stats.nodes} nodes, {stats.dead_ends} dead ends)")
+
+
+def test_search_trace():
+    """Test that a recorded trace rebuilds the DLX search tree."""
+    import tempfile
+    import search_trace
+
+    forbidden = forbidden_for("OCT", 16, "FRI")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.bin")
+        events = core.trace_search(forbidden, path, max_solutions=20, title="OCT 16")
+        meta, stream = search_trace.read_trace(path)
+        assert not isinstance(stream, list), "Events should be streamed, not loaded at once"
+        summary = search_trace.summarize(meta, stream)
+        old_flush, search_trace.FLUSH_BYTES = search_trace.FLUSH_BYTES, 64  # split events across reads
+        try:
+            trace = list(search_trace.read_trace(path)[1])
+        finally:
+            search_trace.FLUSH_BYTES = old_flush
+        assert len(trace) == events, "Every event should be written"
+        assert search_trace.summarize(meta, trace) == summary
+        assert summary["solutions"] == 20, "Trace should record each solution"
+        assert sum(summary["stacks"].values()) + 20 == summary["nodes"]
+        assert sum(1 for kind, _ in trace if kind == search_trace.TRY) == \
+            sum(1 for kind, _ in trace if kind == search_trace.UNDO), "Every row is taken back"
+        assert summary["piece_waste"], "Some rows should lead nowhere"
+        search_trace.write_svg(summary, os.path.join(tmp, "trace.svg"))
+        assert os.path.getsize(os.path.join(tmp, "trace.svg")) > 0
+
+    print(f"✓ Search trace rebuilds the tree ({summary['nodes']} nodes, {events} events)")
+
+
+def test_core_is_headless():
+    """Test that the solver core imports quickly without pygame."""
+    import subprocess
+
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+    code = (
+        "import sys, time; start = time.perf_counter(); import puzzle_core; "
+        "print(time.perf_counter() - start, 'pygame' in sys.modules, 'numpy' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True, check=True)
+    seconds, pygame_loaded, numpy_loaded = out.stdout.split()
+    assert pygame_loaded == "False", "puzzle_core must not import pygame"
+    assert numpy_loaded == "False", "numpy is only imported when placements are generated"
+
+    print(f"✓ puzzle_core imports headless in {float(seconds) * 1000:.1f} ms")
+
+
+def test_unknown_engine():
+    """Test that an unknown engine name is rejected."""
+    try:
+        core.dlx_build_and_solve_all(forbidden_for("JAN", 1, "THU"), engine="nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Should reject unknown engines")
+
+    print("✓ Unknown engines are rejected")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n=== Running Solver Tests ===\n")
+    
+    try:
+        test_cells_to_mask()
+        test_bitboard_solutions_cover_board()
+        test_bitboard_matches_dlx()
+        test_solution_atlas_round_trip()
+        test_batch_solve_dates()
+        test_batch_jsonl()
+        test_solver_service()
+        test_solve_worker()
+        test_parallel_matches_serial()
+        test_dlx_subtree_restores_matrix()
+        test_iter_solutions_streams()
+        test_search_budget()
+        test_count_solutions()
+        test_dead_region_pruning()
+        test_compiled_placements()
+        test_generate_placements_matches_scan()
+        test_solution_cache()
+        test_array_dlx_matches_dlx()
+        test_benchmark_compare()
+        test_search_stats()
+        test_search_trace()
+        test_core_is_headless()
+        test_unknown_engine()
+        
+        print("\n=== ✅ All Tests Passed! ===\n")
+        return 0
+    except AssertionError as e:
+        print(f"\n=== ❌ Test Failed: {e} ===\n")
+        return 1
+    except Exception as e:
+        print(f"\n=== ❌ Unexpected Error: {e} ===\n")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())